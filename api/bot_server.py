@@ -1,43 +1,106 @@
 from flask import Flask, request, jsonify
 import os
+import csv
+import logging
+from datetime import datetime
 from werkzeug.utils import secure_filename
 import threading
-from bulk_newsletter import main as newsletter_main
+from bulk_newsletter import SIGNUP_EMAIL, configure_logging, load_websites_from_csv, iter_text_lines, iter_websites, tail_lines, run_adaptive
 
 app = Flask(__name__)
 
+UPLOAD_DIR = 'uploads'
+
 # Global variables to track progress
 current_progress = 0
 is_running = False
+ingest_stats = {}
+job_status = 'idle'  # 'running', 'completed' or 'failed' once a job has been started
+job_lock = threading.Lock()
 
 def run_newsletter_bot(csv_path):
-    global current_progress, is_running
+    global current_progress, is_running, job_status
+    completed = False
     try:
         is_running = True
+        # Loads the Selenium stack on the first bot run, not at server start
+        from bulk_newsletter import process_website
         # Run the newsletter registration process and track progress
         websites = load_websites_from_csv(csv_path)
         total_websites = len(websites)
+        processed = 0
+        
+        def on_result(website, result):
+            nonlocal processed
+            global current_progress
+            processed += 1
+            current_progress = int((processed / total_websites) * 100)
         
-        for i, website in enumerate(websites, 1):
-            try:
-                process_website(SIGNUP_EMAIL, website, i)
-                current_progress = int((i / total_websites) * 100)
-            except Exception as e:
-                logging.error(f"Error processing website {website}: {e}")
-                continue
+        run_adaptive(
+            websites,
+            lambda website, i, metrics: process_website(SIGNUP_EMAIL, website, i, metrics),
+            on_result=on_result
+        )
                 
         current_progress = 100
+        completed = True
     except Exception as e:
         print(f"Error running bot: {e}")
     finally:
+        job_status = 'completed' if completed else 'failed'
         is_running = False
-        # Cleanup
-        if os.path.exists(csv_path):
+        # Keep the input of a failed job so it can be re-run
+        if completed and os.path.exists(csv_path):
             os.remove(csv_path)
 
+def run_newsletter_bot_from_spool(sites_path, upload_done, spool_paths):
+    """
+    Process websites from the validated-sites spool while the upload handler is still appending to it.
+
+    Args:
+        sites_path: File with one validated website per line, written by the upload handler
+        upload_done: threading.Event set once the handler has stopped writing
+        spool_paths: Files of this job to remove after every row has been processed
+    """
+    global current_progress, is_running, job_status
+    completed = False
+    try:
+        from bulk_newsletter import process_website
+        processed = 0
+        
+        def on_result(website, result):
+            nonlocal processed
+            global current_progress
+            processed += 1
+            # The total keeps growing while the upload is still streaming in
+            total_websites = ingest_stats.get('valid', 0)
+            if total_websites:
+                current_progress = min(99, int((processed / total_websites) * 100))
+        
+        run_adaptive(
+            tail_lines(sites_path, upload_done.is_set),
+            lambda website, i, metrics: process_website(SIGNUP_EMAIL, website, i, metrics),
+            on_result=on_result
+        )
+
+        # A broken upload leaves the job partial: its rows were not all seen
+        completed = ingest_stats.get('upload_complete', False)
+        if completed:
+            current_progress = 100
+    except Exception as e:
+        print(f"Error running bot: {e}")
+    finally:
+        job_status = 'completed' if completed else 'failed'
+        is_running = False
+        # The spooled upload is only removed once every row has been processed
+        if completed:
+            for path in spool_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
 @app.route('/api/start-bot', methods=['POST'])
 def start_bot():
-    global current_progress
+    global current_progress, is_running, ingest_stats, job_status
     
     if 'csv_file' not in request.files:
         return jsonify({'error': 'No file provided'}), 400
@@ -49,10 +112,18 @@ def start_bot():
     if not file.filename.endswith('.csv'):
         return jsonify({'error': 'Invalid file type'}), 400
     
+    with job_lock:
+        if is_running:
+            return jsonify({'error': 'A bot run is already in progress'}), 409
+        is_running = True
+        job_status = 'running'
+        current_progress = 0
+        ingest_stats = {}
+    
     try:
         filename = secure_filename(file.filename)
-        filepath = os.path.join('uploads', filename)
-        os.makedirs('uploads', exist_ok=True)
+        filepath = os.path.join(UPLOAD_DIR, filename)
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
         file.save(filepath)
         
         # Start the bot in a separate thread
@@ -62,14 +133,87 @@ def start_bot():
         return jsonify({'message': 'Bot started successfully'}), 200
         
     except Exception as e:
+        job_status = 'failed'
+        is_running = False
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/ingest', methods=['POST'])
+def ingest_csv_stream():
+    """
+    Start the bot on a CSV sent as the raw request body (Content-Type: text/csv).
+
+    Rows are validated as they arrive and appended to a validated-sites spool
+    file, which the bot thread tails, so the first website is processed while
+    the rest of the file is still uploading and the list is never held in
+    memory. The raw upload and the sites spool are kept in UPLOAD_DIR until the
+    job has processed every row.
+    """
+    global current_progress, is_running, ingest_stats, job_status
+    
+    filename = secure_filename(request.args.get('filename', '')) or 'upload.csv'
+    if not filename.endswith('.csv'):
+        return jsonify({'error': 'Invalid file type'}), 400
+    
+    with job_lock:
+        if is_running:
+            return jsonify({'error': 'A bot run is already in progress'}), 409
+        is_running = True
+        job_status = 'running'
+        current_progress = 0
+        ingest_stats = {'valid': 0, 'invalid': 0, 'duplicate': 0, 'upload_complete': False}
+    
+    job_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+    filepath = os.path.join(UPLOAD_DIR, f"{job_id}_{filename}")
+    sites_path = f"{filepath}.sites"
+    upload_done = threading.Event()
+    
+    try:
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        spool_file = open(filepath, 'wb')
+        sites_file = open(sites_path, 'w', encoding='utf-8')
+    except Exception as e:
+        job_status = 'failed'
+        is_running = False
+        return jsonify({'error': str(e)}), 500
+    
+    thread = threading.Thread(target=run_newsletter_bot_from_spool, args=(sites_path, upload_done, (filepath, sites_path)))
+    thread.start()
+    
+    try:
+        with spool_file, sites_file:
+            csv_reader = csv.reader(iter_text_lines(request.stream, spool_file))
+            next(csv_reader, None)  # Skip header row
+            for website in iter_websites(csv_reader, ingest_stats, deduplicate=True):
+                sites_file.write(f"{website}\n")
+                sites_file.flush()
+            for durable_file in (spool_file, sites_file):
+                durable_file.flush()
+                os.fsync(durable_file.fileno())
+        ingest_stats['upload_complete'] = True
+    except Exception as e:
+        logging.error(f"Error ingesting upload {filename}: {e}")
+        return jsonify({'error': str(e), 'job_id': job_id, 'validation': validation_stats()}), 500
+    finally:
+        upload_done.set()
+    
+    logging.info(f"Ingested {filename}: {validation_stats()}")
+    return jsonify({
+        'message': 'Bot started successfully',
+        'job_id': job_id,
+        'validation': validation_stats()
+    }), 200
+
+def validation_stats():
+    return {key: ingest_stats.get(key, 0) for key in ('valid', 'invalid', 'duplicate')}
+
 @app.route('/api/progress', methods=['GET'])
 def get_progress():
     return jsonify({
         'progress': current_progress,
-        'status': 'completed' if current_progress == 100 else 'running'
+        'status': job_status,
+        'validation': validation_stats()
     })
 
 if __name__ == '__main__':
+    configure_logging()
     app.run(port=5000)
\ No newline at end of file
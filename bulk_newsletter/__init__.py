@@ -0,0 +1,46 @@
+"""
+Bulk newsletter signup and imprint scraping.
+
+Importing the package is side-effect free and does not load Selenium. The
+browser engine (``bulk_newsletter.browser``) is imported on first access to
+one of its names, e.g. ``from bulk_newsletter import process_website``.
+"""
+import importlib
+
+from .config import *  # noqa: F401,F403
+from .keywords import *  # noqa: F401,F403
+from .config import configure_logging
+from .extraction import (
+    check_for_captcha,
+    is_email_input,
+    find_email_inputs_in_html,
+    extract_main_domain,
+    parse_company_info,
+)
+from .csv_io import iter_websites, iter_text_lines, tail_lines, load_websites_from_csv, log_result, save_company_info
+from .snapshots import SnapshotArchive, archive_page, get_snapshot_archive, replay_archive
+from .consent import dismiss_consent_overlay
+from .tracing import SiteTrace, instrument_driver, start_site_trace, finish_site_trace, annotate_site_trace, aggregate_traces
+from .concurrency import AdaptiveConcurrency, run_adaptive
+from .runner import main
+
+# Names served from the browser module, loaded lazily on first access
+_BROWSER_EXPORTS = {
+    'virtual_display',
+    'setup_chrome_options',
+    'create_driver',
+    'current_driver',
+    'scroll_and_wait_for_clickable',
+    'submit_form_with_retry',
+    'signup_to_newsletter',
+    'find_imprint_link',
+    'extract_company_info',
+    'snapshot_page',
+    'process_website',
+}
+
+def __getattr__(name):
+    if name in _BROWSER_EXPORTS:
+        browser = importlib.import_module('.browser', __name__)
+        return getattr(browser, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
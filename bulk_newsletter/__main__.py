@@ -0,0 +1,21 @@
+import sys
+
+from .config import configure_logging
+from .runner import main
+from .snapshots import replay_archive
+from .tracing import print_trace_summary
+
+if __name__ == "__main__":
+    configure_logging()
+    if len(sys.argv) > 1 and sys.argv[1] == 'replay':
+        if len(sys.argv) < 3:
+            print("Usage: python -m bulk_newsletter replay <archive_dir> [output_csv]")
+            sys.exit(1)
+        replay_archive(*sys.argv[2:4])
+    elif len(sys.argv) > 1 and sys.argv[1] == 'traces':
+        if len(sys.argv) < 3:
+            print("Usage: python -m bulk_newsletter traces <trace_dir>")
+            sys.exit(1)
+        print_trace_summary(sys.argv[2])
+    else:
+        main()
@@ -1,32 +1,36 @@
 import os
-import csv
 import random
 import logging
 import time
-import urllib.parse
 import tempfile
 import shutil 
-import re
+import threading
 from contextlib import contextmanager
-from datetime import datetime
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
 
+# This module is the only one that touches Selenium; the package loads it on
+# first use so that pure-Python callers never pay for the browser stack.
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
-    NoSuchElementException,
     TimeoutException,
     StaleElementReferenceException,
     ElementClickInterceptedException,
-    ElementNotInteractableException,
     WebDriverException
 )
 
+from .keywords import IMPRINT_KEYWORDS
+from .consent import dismiss_consent_overlay
+from .extraction import check_for_captcha, is_email_input, parse_company_info
+from .csv_io import log_result, save_company_info
+from .snapshots import archive_page, get_snapshot_archive, PAGE_HOMEPAGE, PAGE_IMPRINT
+from .tracing import start_site_trace, finish_site_trace, annotate_site_trace
+from .concurrency import load_page_timed
+
 # --- Virtual Display Setup ---
 @contextmanager
 def virtual_display(width=1920, height=1080):
@@ -37,56 +41,6 @@ def virtual_display(width=1920, height=1080):
     finally:
         pass
 
-# --- Global Configuration & Bilingual Keyword Sets ---
-LOG_FILENAME = 'signup_log.txt'
-CSV_FILENAME = 'csvimport.csv'
-CAPTCHA_SITES_FILENAME = 'captcha_sites.txt'
-FAULTY_SITES_FILENAME = 'faulty_sites.txt'
-COMPANY_INFO_CSV = 'company_info.csv'
-
-IMPRINT_KEYWORDS = [
-    'imprint', 'impressum', 'legal', 'about us', 'contact', 'legal notice',
-    'company info', 'über uns', 'kontakt', 'mentions légales', 'chi siamo',
-    'contacto', 'about', 'contact us', 'rechtliche hinweise', 'legal information'
-]
-
-COMPANY_INFO_HEADERS = [
-    'Website', 'Company Name', 'Street Address', 'ZIP', 'City', 'Country',
-    'Phone', 'Email', 'CEO/Managing Director', 'Tax ID', 'Commercial Register',
-    'Court of Registration', 'Legal Representatives', 'VAT ID'
-]
-
-# User Data
-SIGNUP_EMAIL = "max.plugilo@example.com"
-SIGNUP_NAME_FULL = "Max Plugilo"
-SIGNUP_FIRST_NAME = "Max"
-SIGNUP_LAST_NAME = "Plugilo"
-SIGNUP_COMPANY = "Plugilo Inc."
-
-# Bilingual Keywords (Lowercase)
-EMAIL_KEYWORDS = ["email", "e-mail", "mailadresse", "your-email", "email address", "e-mail-adresse", "ihre e-mail", "adresse de messagerie"]
-SUBMIT_BUTTON_KEYWORDS = ['subscribe', 'sign up', 'join', 'register', 'go', 'send', 'submit', 'anmelden', 'abonnieren', 'weiter', 'eintragen', 'absenden', 'jetzt anmelden', 's\'inscrire', 'receive', 'bestätigen', 'speichern', 'save', 'order', 'bestellen', 'jetzt registrieren']
-NAVIGATION_LINK_KEYWORDS = ["newsletter", "subscribe", "subscription", "e-news", "updates", "mailing list", "stay informed", "connect", "contact", "kontakt", "anmelden", "abonnieren", "aktuelles", "informiert bleiben", "presseverteiler", "news", "community", "kontaktformular", "contact form", "bleiben sie auf dem laufenden", "e-mail liste"]
-CHECKBOX_KEYWORDS = ["consent", "agree", "terms", "privacy", "policy", "datenschutz", "akzeptieren", "bestätigen", "conditions", "subscribe", "newsletter", "information", "zustimmung", "einverstanden", "datenschutzerklärung", "agb", "data protection", "i have read", "ich habe gelesen", "i accept", "ich akzeptiere", "allgemeine geschäftsbedingungen"]
-UNSUBSCRIBE_CHECKBOX_KEYWORDS = ["unsubscribe", "optout", "opt-out", "abmelden", "no thanks", "don't want", "keine e-mails", "abbestellen", "nicht abonnieren"]
-FIRST_NAME_KEYWORDS = ["firstname", "first_name", "fname", "vorname", "givenname", "first-name"]
-LAST_NAME_KEYWORDS = ["lastname", "last_name", "lname", "nachname", "surname", "familyname", "last-name", "familienname"]
-FULL_NAME_KEYWORDS = ["name", "fullname", "yourname", "your-name", "ihr name", "vollständiger name", "kontaktperson", "ansprechpartner", "full name", "name des kontakts"]
-COMPANY_KEYWORDS = ["company", "organization", "organisation", "firm", "business", "firma", "unternehmen"]
-SUCCESS_MESSAGE_KEYWORDS = ["thank you", "thanks", "success", "subscribed", "confirmation", "check your email", "danke", "vielen dank", "erfolgreich", "bestätigung", "angemeldet", "prüfen sie ihre e-mails", "ihre anmeldung war erfolgreich", "subscription successful", "anmeldung erfolgreich"]
-COOKIE_ACCEPT_KEYWORDS = ['accept all', 'allow all', 'accept cookies', 'accept', 'agree', 'ok', 'got it', 'understand', 'verstanden', 'akzeptieren', 'alle akzeptieren', 'zustimmen', 'einverstanden', 'allow cookies', 'cookies zulassen', 'i agree', 'ich stimme zu', 'confirm', 'bestätigen']
-CAPTCHA_INDICATOR_KEYWORDS = ["verify you are human", "verify you are not a bot", "captcha", " recaptcha", "security check", "sicherheitsüberprüfung", "ich bin kein roboter", "are you human", "menschliche überprüfung"]
-
-# --- Logging Setup ---
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('debug.log'),
-        logging.StreamHandler()
-    ]
-)
-
 # --- Selenium WebDriver Options ---
 def setup_chrome_options(process_id=None):
     chrome_options = ChromeOptions()
@@ -135,51 +89,16 @@ def setup_chrome_options(process_id=None):
     
     return chrome_options
 
-driver = None  # Global driver instance, initialized in main()
+# Each worker thread drives its own browser; process_website() sets it for the signup helpers
+_thread_state = threading.local()
 
-# --- Helper Functions ---
-def scroll_and_wait_for_clickable(element, timeout=10):
-    global driver
-    try:
-        driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center', inline: 'nearest'});", element)
-        time.sleep(random.uniform(0.2, 0.4))  # Short pause for scroll
-        return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(element))
-    except TimeoutException:
-        element_info = f"Tag='{element.tag_name if hasattr(element, 'tag_name') else 'N/A'}'"
-        try:
-            element_info += f", ID='{element.get_attribute('id')}'"
-        except Exception:
-            pass
-        try:
-            element_info += f", Text='{element.text[:30] if hasattr(element, 'text') else ''}'"
-        except Exception:
-            pass
-        logging.warning(f"Timeout waiting for element to be clickable after scroll: {element_info}")
-        raise
-    except Exception as e_scroll:
-        logging.error(f"Error in scroll_and_wait_for_clickable for {getattr(element,'tag_name','N/A')} : {e_scroll}")
-        raise
-
-def check_for_captcha(page_source):
-    captcha_indicators = [
-        'captcha',
-        'recaptcha',
-        'g-recaptcha',
-        'h-captcha',
-        'hcaptcha',
-        'verify you are human',
-        'prove you are human',
-        'are you human',
-        'bot check',
-        'security check',
-        'verification required'
-    ]
-    
-    page_source_lower = page_source.lower()
-    return any(indicator in page_source_lower for indicator in captcha_indicators)
+def current_driver():
+    """Return the WebDriver of the site being processed on this thread."""
+    return getattr(_thread_state, 'driver', None)
 
+# --- Helper Functions ---
 def scroll_and_wait_for_clickable(element_to_interact, timeout=8):
-    global driver
+    driver = current_driver()
     try:
         driver.execute_script("arguments[0].scrollIntoView({behavior: 'auto', block: 'center', inline: 'nearest'});", element_to_interact)
         time.sleep(random.uniform(0.2, 0.4)) # Short pause for scroll
@@ -213,7 +132,7 @@ def submit_form_with_retry(form_element_context, submit_button_element, page_url
     Returns:
         bool: True if submission was successful, False otherwise
     """
-    global driver
+    driver = current_driver()
     max_attempts = 3
     for attempt in range(max_attempts):
         try:
@@ -281,7 +200,7 @@ def submit_form_with_retry(form_element_context, submit_button_element, page_url
     return False
 
 def signup_to_newsletter(url_to_signup, email_str):
-    global driver
+    driver = current_driver()
     logging.info(f"\nAttempting signup for {url_to_signup}")
     try:
         # Wait for at least one input field to be present
@@ -301,16 +220,13 @@ def signup_to_newsletter(url_to_signup, email_str):
         email_inputs = []
         for input_element in inputs:
             try:
-                input_type = input_element.get_attribute("type")
-                input_name = input_element.get_attribute("name") or ""
-                input_id = input_element.get_attribute("id") or ""
-                input_class = input_element.get_attribute("class") or ""
-                input_placeholder = input_element.get_attribute("placeholder") or ""
-                
-                all_attrs = f"{input_type} {input_name} {input_id} {input_class} {input_placeholder}".lower()
-                
-                if ((input_type == "email" or "email" in all_attrs or "mail" in all_attrs)
-                    and not any(exclude in all_attrs for exclude in ["confirm", "verify", "repeat"])):
+                if is_email_input(
+                    input_element.get_attribute("type"),
+                    input_element.get_attribute("name"),
+                    input_element.get_attribute("id"),
+                    input_element.get_attribute("class"),
+                    input_element.get_attribute("placeholder"),
+                ):
                     email_inputs.append(input_element)
             except StaleElementReferenceException:
                 continue
@@ -392,55 +308,6 @@ def signup_to_newsletter(url_to_signup, email_str):
         logging.error(f"Unexpected error on {url_to_signup}: {str(e)}")
         return "Unknown Error"
 
-def extract_main_domain(url):
-    """Extract the main domain from a URL."""
-    try:
-        parsed = urlparse(url)
-        # Get the netloc (e.g., 'www.example.com')
-        domain = parsed.netloc
-        # Remove 'www.' if present
-        if domain.startswith('www.'):
-            domain = domain[4:]
-        # Return the protocol + domain
-        return f"{parsed.scheme}://{domain}"
-    except Exception as e:
-        logging.error(f"Error extracting main domain from {url}: {e}")
-        return url
-
-def load_websites_from_csv(csv_filename):
-    websites = []
-    try:
-        with open(csv_filename, 'r', encoding='utf-8') as csvfile:
-            csv_reader = csv.reader(csvfile)
-            next(csv_reader)  # Skip header row
-            for row in csv_reader:
-                if row and len(row) >= 1:  # Ensure there's at least one column
-                    website = row[0].strip()
-                    if website and website.startswith(('http://', 'https://')):
-                        # Extract and use only the main domain
-                        main_domain = extract_main_domain(website)
-                        websites.append(main_domain)
-                    else:
-                        logging.warning(f"Skipping invalid URL: {website}")
-    except Exception as e:
-        logging.error(f"Error loading CSV file: {e}")
-        raise
-    
-    logging.info(f"Loaded {len(websites)} websites from CSV")
-    return websites
-
-def log_result(url, result):
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    with open(LOG_FILENAME, 'a', encoding='utf-8') as log_file:
-        log_file.write(f"{timestamp}: {url} - {result}\n")
-    
-    if result == "CAPTCHA":
-        with open(CAPTCHA_SITES_FILENAME, 'a', encoding='utf-8') as captcha_file:
-            captcha_file.write(f"{url}\n")
-    elif result != "Success":
-        with open(FAULTY_SITES_FILENAME, 'a', encoding='utf-8') as faulty_file:
-            faulty_file.write(f"{url} - {result}\n")
-
 def find_imprint_link(driver):
     """Find and return the URL of the imprint page."""
     try:
@@ -465,135 +332,66 @@ def find_imprint_link(driver):
 
 def extract_company_info(driver, website):
     """Extract company information from the imprint page."""
-    company_info = {
-        'Website': website,
-        'Company Name': '',
-        'Street Address': '',
-        'ZIP': '',
-        'City': '',
-        'Country': '',
-        'Phone': '',
-        'Email': '',
-        'CEO/Managing Director': '',
-        'Tax ID': '',
-        'Commercial Register': '',
-        'Court of Registration': '',
-        'Legal Representatives': '',
-        'VAT ID': ''
-    }
-    
     try:
-        # Get the page text
-        page_text = driver.page_source.lower()
         text_content = driver.find_element(By.TAG_NAME, 'body').text
-        
-        # Extract information using regular expressions and common patterns
-        
-        # Company Name
-        company_patterns = [
-            r'(?:firma|company|gesellschaft|name):\s*([^\n]+)',
-            r'(?:registered company|company name):\s*([^\n]+)'
-        ]
-        for pattern in company_patterns:
-            match = re.search(pattern, text_content, re.I)
-            if match:
-                company_info['Company Name'] = match.group(1).strip()
-                break
-        
-        # Address
-        address_pattern = r'(?:address|anschrift|adresse):\s*([^\n]+(?:\n[^\n]+){0,2})'
-        match = re.search(address_pattern, text_content, re.I)
-        if match:
-            address = match.group(1).strip()
-            # Try to split address into components
-            address_parts = address.split(',')
-            if len(address_parts) >= 1:
-                company_info['Street Address'] = address_parts[0].strip()
-            if len(address_parts) >= 2:
-                location = address_parts[1].strip()
-                # Try to extract ZIP and City
-                zip_city_match = re.search(r'(\d{4,5})\s*(.+)', location)
-                if zip_city_match:
-                    company_info['ZIP'] = zip_city_match.group(1)
-                    company_info['City'] = zip_city_match.group(2)
-        
-        # Phone
-        phone_pattern = r'(?:phone|tel|telefon|telephone)(?::|.{0,10}?)([+\d\s\-()\/]+)'
-        match = re.search(phone_pattern, text_content, re.I)
-        if match:
-            company_info['Phone'] = match.group(1).strip()
-        
-        # Email
-        email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
-        match = re.search(email_pattern, text_content)
-        if match:
-            company_info['Email'] = match.group(0)
-        
-        # CEO/Managing Director
-        ceo_patterns = [
-            r'(?:ceo|geschäftsführer|managing director|director):\s*([^\n]+)',
-            r'vertreten durch:\s*([^\n]+)'
-        ]
-        for pattern in ceo_patterns:
-            match = re.search(pattern, text_content, re.I)
-            if match:
-                company_info['CEO/Managing Director'] = match.group(1).strip()
-                break
-        
-        # Tax ID and VAT ID
-        tax_patterns = [
-            r'(?:tax id|steuernummer):\s*([\w\s\-\/]+)',
-            r'(?:vat id|ust-idnr|umsatzsteuer-identifikationsnummer)\.?:\s*([\w\s\-\/]+)'
-        ]
-        for pattern in tax_patterns:
-            match = re.search(pattern, text_content, re.I)
-            if match:
-                if 'vat' in pattern.lower():
-                    company_info['VAT ID'] = match.group(1).strip()
-                else:
-                    company_info['Tax ID'] = match.group(1).strip()
-        
-        # Commercial Register
-        register_pattern = r'(?:commercial register|handelsregister|registration number):\s*([^\n]+)'
-        match = re.search(register_pattern, text_content, re.I)
-        if match:
-            company_info['Commercial Register'] = match.group(1).strip()
-        
-        return company_info
-        
     except Exception as e:
         logging.error(f"Error extracting company info: {e}")
-        return company_info
+        text_content = ''
+    return parse_company_info(text_content, website)
 
-def save_company_info(company_info):
-    """Save company information to CSV file."""
-    file_exists = os.path.exists(COMPANY_INFO_CSV)
-    
+def snapshot_page(driver, website, page_type):
+    """
+    Archive the current page if snapshotting is enabled.
+
+    Returns:
+        str: The page's body text when it was archived, otherwise None
+    """
+    if not get_snapshot_archive():
+        return None
     try:
-        with open(COMPANY_INFO_CSV, 'a', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=COMPANY_INFO_HEADERS)
-            
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(company_info)
-            
+        html = driver.page_source
+        text = driver.find_element(By.TAG_NAME, 'body').text
     except Exception as e:
-        logging.error(f"Error saving company info to CSV: {e}")
+        logging.debug(f"Could not capture {page_type} snapshot for {website}: {e}")
+        return None
+    archive_page(website, page_type, driver.current_url, html, text)
+    return text
+
+_driver_install_lock = threading.Lock()
+
+def create_driver(chrome_options):
+    """Start a Chrome instance, resolving the chromedriver binary on first use."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    # Concurrent workers must not download the driver binary at the same time
+    with _driver_install_lock:
+        driver_path = ChromeDriverManager().install()
+    driver_service = ChromeService(driver_path)
+    return webdriver.Chrome(service=driver_service, options=chrome_options)
+
+def process_website(email, website, process_id, metrics=None):
+    """
+    Process a single website with its own browser instance
+
+    Args:
+        metrics: Optional dict that receives 'page_load_seconds' for the homepage load
 
-def process_website(email, website, process_id):
-    """Process a single website with its own browser instance"""
+    Returns:
+        str: The logged result, e.g. "Success", "CAPTCHA", "Timeout" or "Error: ..."
+    """
     chrome_options = setup_chrome_options(process_id)
     local_driver = None
+    trace_handle = None
     
     try:
-        driver_service = ChromeService(ChromeDriverManager().install())
-        local_driver = webdriver.Chrome(service=driver_service, options=chrome_options)
+        local_driver = create_driver(chrome_options)
+        trace_handle = start_site_trace(local_driver, website, process_id)
         
         try:
             # First, visit the main page
-            local_driver.get(website)
+            load_page_timed(local_driver, website, metrics)
             time.sleep(random.uniform(2.0, 3.0))
+            snapshot_page(local_driver, website, PAGE_HOMEPAGE)
+            annotate_site_trace(trace_handle, 'consent', dismiss_consent_overlay(local_driver))
             
             # Look for and visit the imprint page
             imprint_url = find_imprint_link(local_driver)
@@ -607,7 +405,11 @@ def process_website(email, website, process_id):
                 time.sleep(random.uniform(1.5, 2.5))
                 
                 # Extract and save company information
-                company_info = extract_company_info(local_driver, website)
+                imprint_text = snapshot_page(local_driver, website, PAGE_IMPRINT)
+                if imprint_text is not None:
+                    company_info = parse_company_info(imprint_text, website)
+                else:
+                    company_info = extract_company_info(local_driver, website)
                 save_company_info(company_info)
                 
                 # Go back to main page
@@ -618,19 +420,22 @@ def process_website(email, website, process_id):
             if check_for_captcha(local_driver.page_source):
                 logging.warning(f"[Agent {process_id}] CAPTCHA detected on {website}")
                 log_result(website, "CAPTCHA")
-                return
+                return "CAPTCHA"
             
             # Create a context with the local driver
-            global driver
-            driver = local_driver
+            _thread_state.driver = local_driver
             result = signup_to_newsletter(website, email)
             log_result(website, result)
+            return result
             
         except Exception as e:
             logging.error(f"[Agent {process_id}] Error processing {website}: {str(e)}")
             log_result(website, f"Error: {str(e)}")
+            return f"Error: {str(e)}"
     
     finally:
+        _thread_state.driver = None
+        finish_site_trace(trace_handle)
         try:
             if local_driver:
                 chrome_options = local_driver.options if hasattr(local_driver, 'options') else None
@@ -644,33 +449,3 @@ def process_website(email, website, process_id):
         except Exception as e:
             logging.error(f"[Agent {process_id}] Error during cleanup: {e}")
 
-# --- Main Execution ---
-def main():
-    try:
-        websites_to_process = load_websites_from_csv(CSV_FILENAME)
-        email = SIGNUP_EMAIL
-        logging.info(f"Processing {len(websites_to_process)} websites sequentially")
-        
-        # Process websites sequentially
-        for i, website in enumerate(websites_to_process):
-            process_id = i + 1
-            try:
-                process_website(email, website, process_id)
-            except Exception as e:
-                logging.error(f"Error processing website {website}: {e}")
-                continue
-            
-    except Exception as e:
-        logging.error(f"Error in main execution: {e}")
-
-if __name__ == "__main__":
-    # Configure logging to handle multiple processes
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - [%(process)d] - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('debug.log'),
-            logging.StreamHandler()
-        ]
-    )
-    main()
\ No newline at end of file
@@ -0,0 +1,244 @@
+import os
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# --- Adaptive Concurrency Configuration ---
+MIN_WORKERS = int(os.environ.get('BOT_MIN_WORKERS', '1'))
+MAX_WORKERS = int(os.environ.get('BOT_MAX_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+START_WORKERS = int(os.environ.get('BOT_START_WORKERS', str(MIN_WORKERS)))
+DECISION_INTERVAL_SECONDS = 20
+MIN_SAMPLES_PER_DECISION = 3
+MIN_SAMPLES_FOR_ERROR_RATE = 10  # A few dead domains in a small window must not halve the pool
+# Back off when any of these limits is crossed
+MAX_LOAD_PER_CPU = 0.9
+MIN_FREE_MEMORY_MB = 1024
+MAX_TRANSIENT_ERROR_RATE = 0.25
+MAX_LATENCY_INFLATION = 1.5  # Recent average homepage load time vs. the best average seen
+BEST_LATENCY_AGING = 1.05  # Lets the baseline drift up so one fast batch does not pin it
+BEST_LATENCY_WEIGHT = 0.3  # A faster window only moves the baseline this far towards it
+DECREASE_FACTOR = 0.5
+
+TRANSIENT_RESULTS = ("Timeout", "WebDriver Error")
+# "Error: ..." results caused by the local browser rather than the site (dead domains,
+# refused connections and DNS failures are site problems and do not count)
+OVERLOAD_ERROR_MARKERS = (
+    'session not created',
+    'timed out receiving message from renderer',
+    'chrome not reachable',
+    'cannot connect to chrome',
+    'tab crashed',
+    'invalid session id',
+)
+
+
+def is_transient_result(result):
+    """Timeouts and browser failures that indicate an overloaded host rather than a bad site."""
+    if result in TRANSIENT_RESULTS:
+        return True
+    if isinstance(result, str) and result.startswith("Error:"):
+        message = result.lower()
+        return any(marker in message for marker in OVERLOAD_ERROR_MARKERS)
+    return False
+
+
+def load_page_timed(driver, url, metrics=None):
+    """
+    Open ``url`` and store its load time in metrics['page_load_seconds'].
+
+    Nothing is stored when the load fails: a dead domain errors out almost at
+    once and would otherwise count as a very fast page load.
+    """
+    load_start = time.perf_counter()
+    driver.get(url)
+    if metrics is not None:
+        metrics['page_load_seconds'] = time.perf_counter() - load_start
+
+
+def cpu_load_per_core():
+    """1-minute load average divided by CPU count, or None where unavailable."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        pass
+    try:
+        import psutil
+        return psutil.cpu_percent(interval=None) / 100
+    except ImportError:
+        return None
+
+
+def free_memory_mb():
+    """Available system memory in MB, or None where unavailable."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open('/proc/meminfo', 'r', encoding='utf-8') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD controller for the number of concurrently processed sites.
+
+    The target grows by one worker per decision interval while the host is
+    healthy and is halved when CPU load, free memory, homepage load latency or
+    the transient-error rate crosses its limit. It always stays within
+    [min_workers, max_workers].
+    """
+
+    def __init__(self, min_workers=None, max_workers=None, start_workers=None,
+                 sample_cpu=cpu_load_per_core, sample_memory=free_memory_mb, clock=time.monotonic):
+        self.min_workers = max(1, min_workers if min_workers is not None else MIN_WORKERS)
+        self.max_workers = max(self.min_workers, max_workers if max_workers is not None else MAX_WORKERS)
+        start = start_workers if start_workers is not None else START_WORKERS
+        self.target = min(self.max_workers, max(self.min_workers, start))
+        self.sample_cpu = sample_cpu
+        self.sample_memory = sample_memory
+        self.clock = clock
+        self.best_latency = None
+        self.last_decision = clock()
+        self._latencies = deque()
+        self._sites = 0
+        self._transient = 0
+        self._lock = threading.Lock()
+
+    def record(self, result, page_load_seconds=None):
+        """Feed back the outcome and homepage load time (None if it never loaded) of one finished site."""
+        with self._lock:
+            self._sites += 1
+            if page_load_seconds is not None:
+                self._latencies.append(page_load_seconds)
+            if is_transient_result(result):
+                self._transient += 1
+
+    def maybe_adjust(self):
+        """
+        Re-evaluate the target once per decision interval.
+
+        Returns:
+            int: The (possibly changed) target worker count
+        """
+        with self._lock:
+            now = self.clock()
+            samples = self._sites
+            if now - self.last_decision < DECISION_INTERVAL_SECONDS or samples < MIN_SAMPLES_PER_DECISION:
+                return self.target
+
+            error_rate = self._transient / samples
+            load = self.sample_cpu() if self.sample_cpu else None
+            memory = self.sample_memory() if self.sample_memory else None
+            avg_latency = None
+            if len(self._latencies) >= MIN_SAMPLES_PER_DECISION:
+                avg_latency = sum(self._latencies) / len(self._latencies)
+                if self.best_latency is None:
+                    self.best_latency = avg_latency
+                elif avg_latency < self.best_latency:
+                    self.best_latency += BEST_LATENCY_WEIGHT * (avg_latency - self.best_latency)
+                else:
+                    self.best_latency = min(avg_latency, self.best_latency * BEST_LATENCY_AGING)
+
+            reasons = []
+            if load is not None and load > MAX_LOAD_PER_CPU:
+                reasons.append(f"cpu load {load:.2f}/core > {MAX_LOAD_PER_CPU}")
+            if memory is not None and memory < MIN_FREE_MEMORY_MB:
+                reasons.append(f"free memory {memory:.0f}MB < {MIN_FREE_MEMORY_MB}MB")
+            if samples >= MIN_SAMPLES_FOR_ERROR_RATE and error_rate > MAX_TRANSIENT_ERROR_RATE:
+                reasons.append(f"transient errors {error_rate:.0%} > {MAX_TRANSIENT_ERROR_RATE:.0%}")
+            if avg_latency is not None and avg_latency > self.best_latency * MAX_LATENCY_INFLATION:
+                reasons.append(f"page load {avg_latency:.1f}s > {MAX_LATENCY_INFLATION}x best {self.best_latency:.1f}s")
+
+            previous = self.target
+            if reasons:
+                self.target = max(self.min_workers, int(self.target * DECREASE_FACTOR))
+                decision = "decrease"
+            elif self.target < self.max_workers:
+                self.target += 1
+                decision = "increase"
+                reasons.append("healthy")
+            else:
+                decision = "hold"
+                reasons.append("at max workers")
+
+            latency_str = f"{avg_latency:.1f}s" if avg_latency is not None else "n/a"
+            load_str = f"{load:.2f}" if load is not None else "n/a"
+            memory_str = f"{memory:.0f}MB" if memory is not None else "n/a"
+            logging.info(
+                f"Concurrency {decision}: {previous} -> {self.target} workers "
+                f"({'; '.join(reasons)}) [sites={samples}, page load={latency_str}, "
+                f"errors={error_rate:.0%}, load={load_str}, free={memory_str}]"
+            )
+
+            self._latencies.clear()
+            self._sites = 0
+            self._transient = 0
+            self.last_decision = now
+            return self.target
+
+
+def run_adaptive(websites, process_fn, controller=None, on_result=None):
+    """
+    Process websites on a thread pool whose active size follows an AdaptiveConcurrency controller.
+
+    Args:
+        websites: Iterable of websites; may be a blocking generator fed while running
+        process_fn: Called as process_fn(website, index, metrics) and returns the site's result
+            string; it may set metrics['page_load_seconds'] for the controller (see load_page_timed)
+        controller: AdaptiveConcurrency instance; a default one is created if omitted
+        on_result: Optional callback on_result(website, result) after each finished site
+
+    Returns:
+        int: Number of websites processed
+    """
+    controller = controller or AdaptiveConcurrency()
+    logging.info(f"Adaptive concurrency: starting with {controller.target} workers "
+                 f"(bounds {controller.min_workers}-{controller.max_workers})")
+
+    def run_one(website, index):
+        metrics = {}
+        try:
+            result = process_fn(website, index, metrics)
+        except Exception as e:
+            logging.error(f"Error processing website {website}: {e}")
+            result = f"Error: {e}"
+        return website, result, metrics.get('page_load_seconds')
+
+    website_iter = iter(websites)
+    exhausted = False
+    processed = 0
+    submitted = 0
+    in_flight = set()
+    with ThreadPoolExecutor(max_workers=controller.max_workers, thread_name_prefix='site-worker') as pool:
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < controller.target:
+                try:
+                    website = next(website_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                submitted += 1
+                in_flight.add(pool.submit(run_one, website, submitted))
+
+            if not in_flight:
+                continue
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                website, result, page_load_seconds = future.result()
+                processed += 1
+                controller.record(result, page_load_seconds)
+                if on_result:
+                    on_result(website, result)
+            controller.maybe_adjust()
+
+    return processed
@@ -0,0 +1,36 @@
+import logging
+
+# --- Global Configuration ---
+LOG_FILENAME = 'signup_log.txt'
+CSV_FILENAME = 'csvimport.csv'
+CAPTCHA_SITES_FILENAME = 'captcha_sites.txt'
+FAULTY_SITES_FILENAME = 'faulty_sites.txt'
+COMPANY_INFO_CSV = 'company_info.csv'
+
+COMPANY_INFO_HEADERS = [
+    'Website', 'Company Name', 'Street Address', 'ZIP', 'City', 'Country',
+    'Phone', 'Email', 'CEO/Managing Director', 'Tax ID', 'Commercial Register',
+    'Court of Registration', 'Legal Representatives', 'VAT ID'
+]
+
+# User Data
+SIGNUP_EMAIL = "max.plugilo@example.com"
+SIGNUP_NAME_FULL = "Max Plugilo"
+SIGNUP_FIRST_NAME = "Max"
+SIGNUP_LAST_NAME = "Plugilo"
+SIGNUP_COMPANY = "Plugilo Inc."
+
+# --- Logging Setup ---
+LOG_FORMAT = '%(asctime)s - [%(process)d] - %(levelname)s - %(message)s'
+DEBUG_LOG_FILENAME = 'debug.log'
+
+def configure_logging(level=logging.INFO):
+    """Attach the file and console log handlers. Call once from an entry point, never at import."""
+    logging.basicConfig(
+        level=level,
+        format=LOG_FORMAT,
+        handlers=[
+            logging.FileHandler(DEBUG_LOG_FILENAME),
+            logging.StreamHandler()
+        ]
+    )
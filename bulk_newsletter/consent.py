@@ -0,0 +1,108 @@
+import random
+import logging
+import time
+
+from .keywords import (
+    COOKIE_ACCEPT_KEYWORDS,
+    CONSENT_ACCEPT_SELECTORS,
+    CONSENT_CONTAINER_MARKERS,
+    CONSENT_AMBIGUOUS_KEYWORDS,
+    CONSENT_IFRAME_SELECTORS,
+)
+
+# Same value as selenium.webdriver.common.by.By.CSS_SELECTOR; spelled out so this
+# module (and its tests) do not need the browser stack.
+CSS_SELECTOR = 'css selector'
+
+# Labels the keyword fallback may click, in priority order
+CONSENT_FALLBACK_KEYWORDS = [kw for kw in COOKIE_ACCEPT_KEYWORDS if kw not in CONSENT_AMBIGUOUS_KEYWORDS]
+
+# --- Consent Banner Dismissal ---
+# Runs in the page (and in consent iframes): clicks the first visible accept button, trying known
+# consent-manager selectors first, then buttons inside a cookie/consent container whose whole label
+# is one of CONSENT_FALLBACK_KEYWORDS. The container walk stops below <body>, which cookie plugins
+# often tag with classes like 'cookies-not-set'. Open shadow roots are searched too.
+CONSENT_DISMISS_SCRIPT = """
+const [selectors, keywords, markers, anywhere] = arguments;
+const visible = el => { const r = el.getBoundingClientRect(); const s = getComputedStyle(el);
+    return r.width > 0 && r.height > 0 && s.visibility !== 'hidden' && s.display !== 'none'; };
+const roots = [document];
+for (let i = 0; i < roots.length; i++) {
+    for (const el of roots[i].querySelectorAll('*')) { if (el.shadowRoot) roots.push(el.shadowRoot); }
+}
+const clickable = 'button, a, [role="button"], input[type="button"], input[type="submit"]';
+const label = el => (el.innerText || el.value || el.getAttribute('aria-label') || '').trim().toLowerCase().replace(/\\s+/g, ' ');
+const inConsent = el => { for (let n = el; n && n !== document.body && n !== document.documentElement; n = n.parentNode || n.host) {
+    if (!n.getAttribute) continue;
+    const attrs = ((n.id || '') + ' ' + (n.getAttribute('class') || '') + ' ' + (n.getAttribute('aria-label') || '')).toLowerCase();
+    if (markers.some(m => attrs.includes(m))) return true; } return false; };
+const click = (el, via) => { const text = label(el).slice(0, 60); el.click(); return {clicked: true, via: via, label: text}; };
+for (const root of roots) {
+    for (const selector of selectors) {
+        const el = root.querySelector(selector);
+        if (el && visible(el)) return click(el, 'selector');
+    }
+}
+const candidates = [];
+for (const root of roots) {
+    for (const el of root.querySelectorAll(clickable)) {
+        if (visible(el) && (anywhere || inConsent(el))) candidates.push(el);
+    }
+}
+for (const keyword of keywords) {
+    for (const el of candidates) {
+        if (label(el) === keyword) return click(el, 'keyword');
+    }
+}
+return {clicked: false};
+"""
+
+def _run_consent_script(driver, anywhere):
+    return driver.execute_script(CONSENT_DISMISS_SCRIPT, CONSENT_ACCEPT_SELECTORS,
+                                 CONSENT_FALLBACK_KEYWORDS, CONSENT_CONTAINER_MARKERS, anywhere) or {'clicked': False}
+
+def dismiss_consent_overlay(driver):
+    """
+    Click away a cookie-consent banner once, right after page load.
+
+    Looks in the page itself first and then inside known consent-manager
+    iframes, so later clicks are not intercepted by the banner.
+
+    Returns:
+        dict: 'cleared' (bool), 'via', 'label', 'frame' and 'seconds'
+    """
+    start_time = time.perf_counter()
+    result = {'clicked': False}
+    frame_name = None
+    try:
+        result = _run_consent_script(driver, False)
+        if not result.get('clicked'):
+            for frame in driver.find_elements(CSS_SELECTOR, ', '.join(CONSENT_IFRAME_SELECTORS)):
+                try:
+                    frame_name = frame.get_attribute('id') or frame.get_attribute('src')
+                    driver.switch_to.frame(frame)
+                    # Everything inside a consent-manager iframe belongs to the dialog
+                    result = _run_consent_script(driver, True)
+                except Exception as e_frame:
+                    logging.debug(f"Error checking consent iframe {frame_name}: {e_frame}")
+                finally:
+                    driver.switch_to.default_content()
+                if result.get('clicked'):
+                    break
+    except Exception as e:
+        logging.debug(f"Error dismissing consent overlay: {e}")
+
+    report = {
+        'cleared': bool(result.get('clicked')),
+        'via': result.get('via'),
+        'label': result.get('label'),
+        'frame': frame_name if result.get('clicked') else None,
+        'seconds': round(time.perf_counter() - start_time, 3),
+    }
+    if report['cleared']:
+        logging.info(f"Dismissed consent overlay via {report['via']} '{report['label']}'"
+                     f"{' in iframe ' + str(report['frame']) if report['frame'] else ''} in {report['seconds']}s")
+        time.sleep(random.uniform(0.3, 0.6))  # Let the banner close before interacting
+    else:
+        logging.debug(f"No consent overlay found ({report['seconds']}s)")
+    return report
@@ -0,0 +1,136 @@
+import csv
+import time
+import codecs
+import hashlib
+import logging
+import threading
+from datetime import datetime
+
+from .config import LOG_FILENAME, CAPTCHA_SITES_FILENAME, FAULTY_SITES_FILENAME, COMPANY_INFO_CSV, COMPANY_INFO_HEADERS
+from .extraction import extract_main_domain
+
+# Result files are appended to from concurrent worker threads
+_write_lock = threading.Lock()
+
+def iter_websites(rows, stats=None, deduplicate=False):
+    """
+    Validate CSV rows and yield the main domain of each usable website.
+
+    Args:
+        rows: Iterable of parsed CSV rows, header already skipped
+        stats: Optional dict updated in place with 'valid', 'invalid' and 'duplicate' counts
+        deduplicate: Skip websites whose main domain was already yielded. Only an
+            8-byte digest per domain is kept, so large lists stay small in memory.
+    """
+    if stats is None:
+        stats = {}
+    for key in ('valid', 'invalid', 'duplicate'):
+        stats.setdefault(key, 0)
+    seen = set()
+    for row in rows:
+        if row and len(row) >= 1:  # Ensure there's at least one column
+            website = row[0].strip()
+            if website and website.startswith(('http://', 'https://')):
+                # Extract and use only the main domain
+                main_domain = extract_main_domain(website)
+                if deduplicate:
+                    domain_key = hashlib.blake2b(main_domain.encode('utf-8'), digest_size=8).digest()
+                    if domain_key in seen:
+                        stats['duplicate'] += 1
+                        continue
+                    seen.add(domain_key)
+                stats['valid'] += 1
+                yield main_domain
+            else:
+                stats['invalid'] += 1
+                logging.warning(f"Skipping invalid URL: {website}")
+
+def iter_text_lines(binary_stream, spool_file=None, chunk_size=64 * 1024):
+    """
+    Decode a UTF-8 byte stream into lines as it arrives.
+
+    Args:
+        binary_stream: File-like object with a read(size) method, e.g. a request body
+        spool_file: Optional binary file that receives every raw chunk before it is parsed
+        chunk_size: Number of bytes to read at a time
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    while True:
+        chunk = binary_stream.read(chunk_size)
+        if not chunk:
+            break
+        if spool_file is not None:
+            spool_file.write(chunk)
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        # The last piece may be a partial line; keep it until more data arrives
+        pending = lines.pop() if lines and not lines[-1].endswith(('\n', '\r')) else ''
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+def tail_lines(path, is_complete, poll_interval=0.5):
+    """
+    Yield lines from a file that another thread is still appending to.
+
+    Partial lines are held back until their newline is written. The generator
+    ends once ``is_complete()`` is true and everything written has been read.
+    """
+    with open(path, 'r', encoding='utf-8') as tail_file:
+        while True:
+            # Check before reading so a line written just before completion is not missed
+            complete = is_complete()
+            position = tail_file.tell()
+            line = tail_file.readline()
+            if line.endswith('\n'):
+                yield line.rstrip('\n')
+            elif complete:
+                if line:
+                    yield line
+                return
+            else:
+                tail_file.seek(position)
+                time.sleep(poll_interval)
+
+def load_websites_from_csv(csv_filename):
+    try:
+        with open(csv_filename, 'r', encoding='utf-8') as csvfile:
+            csv_reader = csv.reader(csvfile)
+            next(csv_reader)  # Skip header row
+            websites = list(iter_websites(csv_reader))
+    except Exception as e:
+        logging.error(f"Error loading CSV file: {e}")
+        raise
+    
+    logging.info(f"Loaded {len(websites)} websites from CSV")
+    return websites
+
+def log_result(url, result):
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with _write_lock:
+        with open(LOG_FILENAME, 'a', encoding='utf-8') as log_file:
+            log_file.write(f"{timestamp}: {url} - {result}\n")
+        
+        if result == "CAPTCHA":
+            with open(CAPTCHA_SITES_FILENAME, 'a', encoding='utf-8') as captcha_file:
+                captcha_file.write(f"{url}\n")
+        elif result != "Success":
+            with open(FAULTY_SITES_FILENAME, 'a', encoding='utf-8') as faulty_file:
+                faulty_file.write(f"{url} - {result}\n")
+
+def save_company_info(company_info):
+    """Save company information to CSV file."""
+    try:
+        with _write_lock, open(COMPANY_INFO_CSV, 'a', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=COMPANY_INFO_HEADERS)
+            
+            if csvfile.tell() == 0:
+                writer.writeheader()
+            
+            writer.writerow(company_info)
+            
+    except Exception as e:
+        logging.error(f"Error saving company info to CSV: {e}")
+
@@ -0,0 +1,165 @@
+import re
+import logging
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+def check_for_captcha(page_source):
+    captcha_indicators = [
+        'captcha',
+        'recaptcha',
+        'g-recaptcha',
+        'h-captcha',
+        'hcaptcha',
+        'verify you are human',
+        'prove you are human',
+        'are you human',
+        'bot check',
+        'security check',
+        'verification required'
+    ]
+    
+    page_source_lower = page_source.lower()
+    return any(indicator in page_source_lower for indicator in captcha_indicators)
+
+def is_email_input(input_type, name, input_id, input_class, placeholder):
+    """Decide from an input's attributes whether it is a newsletter email field."""
+    all_attrs = f"{input_type} {name or ''} {input_id or ''} {input_class or ''} {placeholder or ''}".lower()
+    return ((input_type == "email" or "email" in all_attrs or "mail" in all_attrs)
+            and not any(exclude in all_attrs for exclude in ["confirm", "verify", "repeat"]))
+
+class _InputCollector(HTMLParser):
+    """Collects the attributes of every <input> tag in a document."""
+    def __init__(self):
+        super().__init__()
+        self.inputs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'input':
+            self.inputs.append(dict(attrs))
+
+def find_email_inputs_in_html(page_source):
+    """Return attribute dicts of the email inputs in raw HTML, without a browser."""
+    collector = _InputCollector()
+    try:
+        collector.feed(page_source)
+    except Exception as e:
+        logging.debug(f"Error parsing HTML for inputs: {e}")
+    return [
+        attrs for attrs in collector.inputs
+        if is_email_input(attrs.get('type'), attrs.get('name'), attrs.get('id'),
+                          attrs.get('class'), attrs.get('placeholder'))
+    ]
+
+def extract_main_domain(url):
+    """Extract the main domain from a URL."""
+    try:
+        parsed = urlparse(url)
+        # Get the netloc (e.g., 'www.example.com')
+        domain = parsed.netloc
+        # Remove 'www.' if present
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        # Return the protocol + domain
+        return f"{parsed.scheme}://{domain}"
+    except Exception as e:
+        logging.error(f"Error extracting main domain from {url}: {e}")
+        return url
+
+def parse_company_info(text_content, website):
+    """Parse company information from the body text of an imprint page."""
+    company_info = {
+        'Website': website,
+        'Company Name': '',
+        'Street Address': '',
+        'ZIP': '',
+        'City': '',
+        'Country': '',
+        'Phone': '',
+        'Email': '',
+        'CEO/Managing Director': '',
+        'Tax ID': '',
+        'Commercial Register': '',
+        'Court of Registration': '',
+        'Legal Representatives': '',
+        'VAT ID': ''
+    }
+    
+    try:
+        # Extract information using regular expressions and common patterns
+        
+        # Company Name
+        company_patterns = [
+            r'(?:firma|company|gesellschaft|name):\s*([^\n]+)',
+            r'(?:registered company|company name):\s*([^\n]+)'
+        ]
+        for pattern in company_patterns:
+            match = re.search(pattern, text_content, re.I)
+            if match:
+                company_info['Company Name'] = match.group(1).strip()
+                break
+        
+        # Address
+        address_pattern = r'(?:address|anschrift|adresse):\s*([^\n]+(?:\n[^\n]+){0,2})'
+        match = re.search(address_pattern, text_content, re.I)
+        if match:
+            address = match.group(1).strip()
+            # Try to split address into components
+            address_parts = address.split(',')
+            if len(address_parts) >= 1:
+                company_info['Street Address'] = address_parts[0].strip()
+            if len(address_parts) >= 2:
+                location = address_parts[1].strip()
+                # Try to extract ZIP and City
+                zip_city_match = re.search(r'(\d{4,5})\s*(.+)', location)
+                if zip_city_match:
+                    company_info['ZIP'] = zip_city_match.group(1)
+                    company_info['City'] = zip_city_match.group(2)
+        
+        # Phone
+        phone_pattern = r'(?:phone|tel|telefon|telephone)(?::|.{0,10}?)([+\d\s\-()\/]+)'
+        match = re.search(phone_pattern, text_content, re.I)
+        if match:
+            company_info['Phone'] = match.group(1).strip()
+        
+        # Email
+        email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
+        match = re.search(email_pattern, text_content)
+        if match:
+            company_info['Email'] = match.group(0)
+        
+        # CEO/Managing Director
+        ceo_patterns = [
+            r'(?:ceo|geschäftsführer|managing director|director):\s*([^\n]+)',
+            r'vertreten durch:\s*([^\n]+)'
+        ]
+        for pattern in ceo_patterns:
+            match = re.search(pattern, text_content, re.I)
+            if match:
+                company_info['CEO/Managing Director'] = match.group(1).strip()
+                break
+        
+        # Tax ID and VAT ID
+        tax_patterns = [
+            r'(?:tax id|steuernummer):\s*([\w\s\-\/]+)',
+            r'(?:vat id|ust-idnr|umsatzsteuer-identifikationsnummer)\.?:\s*([\w\s\-\/]+)'
+        ]
+        for pattern in tax_patterns:
+            match = re.search(pattern, text_content, re.I)
+            if match:
+                if 'vat' in pattern.lower():
+                    company_info['VAT ID'] = match.group(1).strip()
+                else:
+                    company_info['Tax ID'] = match.group(1).strip()
+        
+        # Commercial Register
+        register_pattern = r'(?:commercial register|handelsregister|registration number):\s*([^\n]+)'
+        match = re.search(register_pattern, text_content, re.I)
+        if match:
+            company_info['Commercial Register'] = match.group(1).strip()
+        
+        return company_info
+        
+    except Exception as e:
+        logging.error(f"Error extracting company info: {e}")
+        return company_info
+
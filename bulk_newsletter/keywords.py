@@ -0,0 +1,49 @@
+# --- Bilingual Keyword Sets (Lowercase) ---
+IMPRINT_KEYWORDS = [
+    'imprint', 'impressum', 'legal', 'about us', 'contact', 'legal notice',
+    'company info', 'über uns', 'kontakt', 'mentions légales', 'chi siamo',
+    'contacto', 'about', 'contact us', 'rechtliche hinweise', 'legal information'
+]
+
+EMAIL_KEYWORDS = ["email", "e-mail", "mailadresse", "your-email", "email address", "e-mail-adresse", "ihre e-mail", "adresse de messagerie"]
+SUBMIT_BUTTON_KEYWORDS = ['subscribe', 'sign up', 'join', 'register', 'go', 'send', 'submit', 'anmelden', 'abonnieren', 'weiter', 'eintragen', 'absenden', 'jetzt anmelden', 's\'inscrire', 'receive', 'bestätigen', 'speichern', 'save', 'order', 'bestellen', 'jetzt registrieren']
+NAVIGATION_LINK_KEYWORDS = ["newsletter", "subscribe", "subscription", "e-news", "updates", "mailing list", "stay informed", "connect", "contact", "kontakt", "anmelden", "abonnieren", "aktuelles", "informiert bleiben", "presseverteiler", "news", "community", "kontaktformular", "contact form", "bleiben sie auf dem laufenden", "e-mail liste"]
+CHECKBOX_KEYWORDS = ["consent", "agree", "terms", "privacy", "policy", "datenschutz", "akzeptieren", "bestätigen", "conditions", "subscribe", "newsletter", "information", "zustimmung", "einverstanden", "datenschutzerklärung", "agb", "data protection", "i have read", "ich habe gelesen", "i accept", "ich akzeptiere", "allgemeine geschäftsbedingungen"]
+UNSUBSCRIBE_CHECKBOX_KEYWORDS = ["unsubscribe", "optout", "opt-out", "abmelden", "no thanks", "don't want", "keine e-mails", "abbestellen", "nicht abonnieren"]
+FIRST_NAME_KEYWORDS = ["firstname", "first_name", "fname", "vorname", "givenname", "first-name"]
+LAST_NAME_KEYWORDS = ["lastname", "last_name", "lname", "nachname", "surname", "familyname", "last-name", "familienname"]
+FULL_NAME_KEYWORDS = ["name", "fullname", "yourname", "your-name", "ihr name", "vollständiger name", "kontaktperson", "ansprechpartner", "full name", "name des kontakts"]
+COMPANY_KEYWORDS = ["company", "organization", "organisation", "firm", "business", "firma", "unternehmen"]
+SUCCESS_MESSAGE_KEYWORDS = ["thank you", "thanks", "success", "subscribed", "confirmation", "check your email", "danke", "vielen dank", "erfolgreich", "bestätigung", "angemeldet", "prüfen sie ihre e-mails", "ihre anmeldung war erfolgreich", "subscription successful", "anmeldung erfolgreich"]
+COOKIE_ACCEPT_KEYWORDS = ['accept all', 'allow all', 'accept cookies', 'accept', 'agree', 'ok', 'got it', 'understand', 'verstanden', 'akzeptieren', 'alle akzeptieren', 'zustimmen', 'einverstanden', 'allow cookies', 'cookies zulassen', 'i agree', 'ich stimme zu', 'confirm', 'bestätigen']
+CAPTCHA_INDICATOR_KEYWORDS = ["verify you are human", "verify you are not a bot", "captcha", " recaptcha", "security check", "sicherheitsüberprüfung", "ich bin kein roboter", "are you human", "menschliche überprüfung"]
+
+# Accept buttons of common consent managers (OneTrust, Cookiebot, Didomi, Usercentrics, Borlabs, Quantcast, CookieConsent)
+CONSENT_ACCEPT_SELECTORS = [
+    '#onetrust-accept-btn-handler',
+    '#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll',
+    '#CybotCookiebotDialogBodyButtonAccept',
+    '#didomi-notice-agree-button',
+    '[data-testid="uc-accept-all-button"]',
+    '#BorlabsCookieBox a[data-cookie-accept-all]',
+    '.qc-cmp2-summary-buttons button[mode="primary"]',
+    '.cc-allow',
+    '.cc-dismiss',
+]
+# Markers on banner containers that hold a consent dialog, matched as substrings of id/class/aria-label.
+# Generic words like 'cmp' (AEM 'cmp-container') or 'privacy'/'datenschutz' (newsletter opt-in wrappers) are left out.
+CONSENT_CONTAINER_MARKERS = ['cookie', 'consent', 'gdpr', 'onetrust', 'cybot', 'didomi', 'usercentrics', 'sp_message', 'truste']
+# Too generic to click on label alone: they also appear on newsletter and order buttons
+CONSENT_AMBIGUOUS_KEYWORDS = ['ok', 'confirm', 'bestätigen']
+# Iframes served by consent managers (Sourcepoint, TrustArc, Usercentrics, consentmanager, Cookiebot, generic consent/cmp hosts)
+CONSENT_IFRAME_SELECTORS = [
+    "iframe[id^='sp_message_iframe']",
+    "iframe[src*='privacy-mgmt.com']",
+    "iframe[src*='//consent.']",
+    "iframe[src*='//cmp.']",
+    "iframe[src*='usercentrics']",
+    "iframe[src*='truste']",
+    "iframe[src*='trustarc']",
+    "iframe[src*='consentmanager.net']",
+    "iframe[src*='cookiebot.com']",
+]
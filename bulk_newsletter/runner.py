@@ -0,0 +1,21 @@
+import logging
+
+from .config import CSV_FILENAME, SIGNUP_EMAIL
+from .csv_io import load_websites_from_csv
+from .concurrency import run_adaptive
+
+# --- Main Execution ---
+def main():
+    from .browser import process_website
+    try:
+        websites_to_process = load_websites_from_csv(CSV_FILENAME)
+        email = SIGNUP_EMAIL
+        logging.info(f"Processing {len(websites_to_process)} websites with adaptive concurrency")
+        
+        run_adaptive(
+            websites_to_process,
+            lambda website, process_id, metrics: process_website(email, website, process_id, metrics)
+        )
+            
+    except Exception as e:
+        logging.error(f"Error in main execution: {e}")
@@ -0,0 +1,207 @@
+import os
+import csv
+import json
+import zlib
+import hashlib
+import logging
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+from .config import COMPANY_INFO_HEADERS
+from .extraction import check_for_captcha, find_email_inputs_in_html, parse_company_info
+
+# --- Snapshot Archive Configuration ---
+# Archiving is off unless a directory is configured here or via the environment.
+SNAPSHOT_ARCHIVE_DIR = os.environ.get('SNAPSHOT_ARCHIVE_DIR')
+SNAPSHOT_INDEX_FILENAME = 'index.jsonl'
+SNAPSHOT_BLOB_DIRNAME = 'blobs'
+SNAPSHOT_COMPRESSION_LEVEL = 6
+REPLAY_RESULTS_CSV = 'replay_results.csv'
+
+PAGE_HOMEPAGE = 'homepage'
+PAGE_IMPRINT = 'imprint'
+
+
+def snapshot_domain(url):
+    """Return the bare host of a URL, used as the archive index key."""
+    domain = urlparse(url).netloc.lower()
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain or url
+
+
+class SnapshotArchive:
+    """
+    Content-addressed store of fetched pages.
+
+    Every HTML document and body text is zlib-compressed and stored once under
+    its SHA-256 hash in ``blobs/``. ``index.jsonl`` is an append-only log with one
+    line per captured page, referencing the blobs by hash.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        self.blob_dir = os.path.join(root_dir, SNAPSHOT_BLOB_DIRNAME)
+        self.index_path = os.path.join(root_dir, SNAPSHOT_INDEX_FILENAME)
+        self._lock = threading.Lock()
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.z")
+
+    def put_blob(self, content):
+        """Store a string and return its hash. Identical content is written only once."""
+        data = (content or '').encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as blob_file:
+                blob_file.write(zlib.compress(data, SNAPSHOT_COMPRESSION_LEVEL))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest
+
+    def get_blob(self, digest):
+        """Load and decompress a stored string by its hash."""
+        with open(self._blob_path(digest), 'rb') as blob_file:
+            return zlib.decompress(blob_file.read()).decode('utf-8')
+
+    def save_page(self, website, page_type, url, html, text):
+        """Archive one page of a website and append it to the index."""
+        entry = {
+            'domain': snapshot_domain(website),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'website': website,
+            'page': page_type,
+            'url': url,
+            'html': self.put_blob(html),
+            'text': self.put_blob(text),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.index_path, 'a', encoding='utf-8') as index_file:
+                index_file.write(line + '\n')
+        return entry
+
+    def iter_entries(self, domain=None, page_type=None, since=None):
+        """
+        Stream index entries without loading the whole index into memory.
+
+        Args:
+            domain: Only yield entries for this domain (as returned by snapshot_domain)
+            page_type: Only yield entries of this page type ('homepage' or 'imprint')
+            since: Only yield entries with an ISO timestamp >= this value
+        """
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as index_file:
+            for line in index_file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logging.warning(f"Skipping corrupt snapshot index line: {line[:80]}")
+                    continue
+                if domain and entry.get('domain') != domain:
+                    continue
+                if page_type and entry.get('page') != page_type:
+                    continue
+                if since and entry.get('timestamp', '') < since:
+                    continue
+                yield entry
+
+    def latest_snapshots(self, page_type=None):
+        """Return the most recent index entry per (domain, page) pair."""
+        latest = {}
+        for entry in self.iter_entries(page_type=page_type):
+            key = (entry['domain'], entry['page'])
+            if key not in latest or entry['timestamp'] >= latest[key]['timestamp']:
+                latest[key] = entry
+        return latest
+
+    def load_page(self, entry):
+        """Return (html, text) for an index entry."""
+        return self.get_blob(entry['html']), self.get_blob(entry['text'])
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_snapshot_archive():
+    """Return the configured archive, or None when archiving is disabled."""
+    global _archive
+    if not SNAPSHOT_ARCHIVE_DIR:
+        return None
+    with _archive_lock:
+        if _archive is None or _archive.root_dir != SNAPSHOT_ARCHIVE_DIR:
+            _archive = SnapshotArchive(SNAPSHOT_ARCHIVE_DIR)
+        return _archive
+
+
+def archive_page(website, page_type, url, html, text):
+    """Save a page to the configured archive. Never raises; archiving must not break a run."""
+    archive = get_snapshot_archive()
+    if archive is None:
+        return None
+    try:
+        return archive.save_page(website, page_type, url, html, text)
+    except Exception as e:
+        logging.warning(f"Failed to archive {page_type} snapshot for {website}: {e}")
+        return None
+
+
+# --- Offline Replay ---
+def replay_archive(archive_dir, output_csv=REPLAY_RESULTS_CSV):
+    """
+    Re-run detection and extraction over the latest snapshot of every site.
+
+    Homepages are checked for CAPTCHAs and email inputs; imprint pages are run
+    through the company info parser. Results are written to ``output_csv``.
+
+    Returns:
+        int: Number of websites replayed
+    """
+    archive = SnapshotArchive(archive_dir)
+    start_time = time.time()
+    sites = {}
+    for (domain, page_type), entry in archive.latest_snapshots().items():
+        sites.setdefault(domain, {})[page_type] = entry
+
+    headers = COMPANY_INFO_HEADERS + ['CAPTCHA', 'Email Inputs']
+    with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=headers)
+        writer.writeheader()
+        for domain in sorted(sites):
+            pages = sites[domain]
+            website = next(iter(pages.values()))['website']
+            row = {header: '' for header in headers}
+            row['Website'] = website
+            try:
+                if PAGE_IMPRINT in pages:
+                    _, imprint_text = archive.load_page(pages[PAGE_IMPRINT])
+                    row.update(parse_company_info(imprint_text, website))
+                if PAGE_HOMEPAGE in pages:
+                    homepage_html, _ = archive.load_page(pages[PAGE_HOMEPAGE])
+                    row['CAPTCHA'] = check_for_captcha(homepage_html)
+                    row['Email Inputs'] = len(find_email_inputs_in_html(homepage_html))
+            except Exception as e:
+                logging.error(f"Error replaying snapshot for {domain}: {e}")
+            writer.writerow(row)
+
+    logging.info(f"Replayed {len(sites)} websites in {time.time() - start_time:.1f}s -> {output_csv}")
+    return len(sites)
+
@@ -0,0 +1,254 @@
+import os
+import sys
+import json
+import random
+import logging
+import cProfile
+import threading
+import time
+from datetime import datetime
+
+from .snapshots import snapshot_domain
+
+# --- Tracing Configuration ---
+# Tracing is off unless a directory is configured here or via the environment.
+TRACE_DIR = os.environ.get('WEBDRIVER_TRACE_DIR')
+# Fraction of traced sites that additionally get a cProfile capture (0.0 - 1.0)
+PROFILE_SAMPLE_RATE = float(os.environ.get('WEBDRIVER_PROFILE_SAMPLE_RATE', '0'))
+
+# Only one site is profiled at a time: since Python 3.12 a profiler is process-wide,
+# so a second enable() fails and the active profile would mix in other workers' sites
+_profile_lock = threading.Lock()
+
+_TRACE_SKIP_MODULE_PREFIXES = ('selenium', 'urllib3', 'http', 'socket', __name__)
+
+
+def _calling_function():
+    """Return 'module.function' of the nearest caller outside Selenium and this module."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith(_TRACE_SKIP_MODULE_PREFIXES):
+            return f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class SiteTrace:
+    """Count and latency of every WebDriver command issued while processing one site."""
+
+    def __init__(self, website, process_id=None):
+        self.website = website
+        self.process_id = process_id
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.start_time = time.perf_counter()
+        self.wall_seconds = None
+        self.commands = {}  # (command, caller) -> [count, total_seconds, max_seconds, errors]
+        self.profile = None
+        self.annotations = {}  # Per-site stage reports, e.g. 'consent'
+        self._lock = threading.Lock()
+
+    def record(self, command, caller, elapsed, failed=False):
+        with self._lock:
+            stats = self.commands.setdefault((command, caller), [0, 0.0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            if failed:
+                stats[3] += 1
+
+    def to_dict(self):
+        commands = [
+            {
+                'command': command,
+                'caller': caller,
+                'count': count,
+                'total_seconds': round(total, 6),
+                'max_seconds': round(max_seconds, 6),
+                'errors': errors,
+            }
+            for (command, caller), (count, total, max_seconds, errors)
+            in sorted(self.commands.items(), key=lambda item: -item[1][1])
+        ]
+        return {
+            'website': self.website,
+            'process_id': self.process_id,
+            'started_at': self.started_at,
+            'wall_seconds': round(self.wall_seconds, 3) if self.wall_seconds is not None else None,
+            'command_count': sum(c['count'] for c in commands),
+            'command_seconds': round(sum(c['total_seconds'] for c in commands), 6),
+            'profiled': self.profile is not None,
+            **self.annotations,
+            'commands': commands,
+        }
+
+
+def instrument_driver(driver, trace):
+    """
+    Wrap the driver's command executor so every WebDriver round trip is recorded in ``trace``.
+
+    Returns:
+        callable: The original ``execute`` method, for uninstrument_driver()
+    """
+    executor = driver.command_executor
+    original_execute = executor.execute
+
+    def traced_execute(command, params):
+        caller = _calling_function()
+        start = time.perf_counter()
+        failed = False
+        try:
+            return original_execute(command, params)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            trace.record(command, caller, time.perf_counter() - start, failed)
+
+    executor.execute = traced_execute
+    return original_execute
+
+
+def uninstrument_driver(driver, original_execute):
+    """Restore a command executor wrapped by instrument_driver()."""
+    driver.command_executor.execute = original_execute
+
+
+def start_site_trace(driver, website, process_id=None):
+    """
+    Begin tracing a site if WebDriver tracing is enabled.
+
+    Returns:
+        tuple: Handle for finish_site_trace(), or None when tracing is disabled
+    """
+    if not TRACE_DIR:
+        return None
+    trace = SiteTrace(website, process_id)
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE and _profile_lock.acquire(blocking=False):
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+            trace.profile = profile
+        except Exception as e:
+            _profile_lock.release()
+            logging.warning(f"Could not start profiler for {website}: {e}")
+    try:
+        # Instrument only once the profiler is settled, so a failure cannot leave the driver wrapped
+        original_execute = instrument_driver(driver, trace)
+        return trace, driver, original_execute
+    except Exception as e:
+        _stop_profile(trace)
+        logging.warning(f"Could not start WebDriver trace for {website}: {e}")
+        return None
+
+
+def _stop_profile(trace):
+    """Disable a site's profiler and let the next sampled site profile."""
+    if trace.profile is None:
+        return
+    try:
+        trace.profile.disable()
+    finally:
+        _profile_lock.release()
+
+
+def annotate_site_trace(handle, key, value):
+    """Attach a stage report (any JSON-serialisable value) to the site's trace file."""
+    if handle is not None:
+        handle[0].annotations[key] = value
+
+
+def finish_site_trace(handle):
+    """Stop tracing and write ``<domain>_<timestamp>_<process_id>.json`` (and ``.prof``) to TRACE_DIR."""
+    if handle is None:
+        return None
+    trace, driver, original_execute = handle
+    try:
+        uninstrument_driver(driver, original_execute)
+        _stop_profile(trace)
+        trace.wall_seconds = time.perf_counter() - trace.start_time
+
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        stamp = trace.started_at.replace(':', '').replace('-', '')
+        base_path = os.path.join(TRACE_DIR, f"{snapshot_domain(trace.website)}_{stamp}_{trace.process_id}")
+        with open(f"{base_path}.json", 'w', encoding='utf-8') as trace_file:
+            json.dump(trace.to_dict(), trace_file, indent=2)
+        if trace.profile is not None:
+            trace.profile.dump_stats(f"{base_path}.prof")
+        return f"{base_path}.json"
+    except Exception as e:
+        logging.warning(f"Could not write WebDriver trace for {trace.website}: {e}")
+        return None
+
+
+def aggregate_traces(trace_dir):
+    """
+    Combine all per-site trace files in a directory.
+
+    Returns:
+        list: One dict per (command, caller) with summed count/seconds, slowest first
+    """
+    totals = {}
+    for filename in sorted(os.listdir(trace_dir)):
+        if not filename.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(trace_dir, filename), 'r', encoding='utf-8') as trace_file:
+                site = json.load(trace_file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Skipping unreadable trace file {filename}: {e}")
+            continue
+        for entry in site.get('commands', []):
+            key = (entry['command'], entry['caller'])
+            total = totals.setdefault(key, {
+                'command': entry['command'],
+                'caller': entry['caller'],
+                'count': 0,
+                'total_seconds': 0.0,
+                'max_seconds': 0.0,
+                'errors': 0,
+                'sites': 0,
+            })
+            total['count'] += entry['count']
+            total['total_seconds'] += entry['total_seconds']
+            total['max_seconds'] = max(total['max_seconds'], entry['max_seconds'])
+            total['errors'] += entry.get('errors', 0)
+            total['sites'] += 1
+    return sorted(totals.values(), key=lambda total: -total['total_seconds'])
+
+
+def summarize_consent(trace_dir):
+    """
+    Summarise the consent-dismissal reports stored in per-site trace files.
+
+    Returns:
+        dict: 'sites' with a report, 'cleared' count, and 'total_seconds' spent in the stage
+    """
+    summary = {'sites': 0, 'cleared': 0, 'total_seconds': 0.0}
+    for filename in sorted(os.listdir(trace_dir)):
+        if not filename.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(trace_dir, filename), 'r', encoding='utf-8') as trace_file:
+                consent = json.load(trace_file).get('consent')
+        except (OSError, ValueError):
+            continue
+        if not consent:
+            continue
+        summary['sites'] += 1
+        summary['cleared'] += 1 if consent.get('cleared') else 0
+        summary['total_seconds'] += consent.get('seconds') or 0.0
+    return summary
+
+
+def print_trace_summary(trace_dir, limit=30):
+    """Print the slowest WebDriver command/caller pairs across all traced sites."""
+    print(f"{'seconds':>10} {'count':>8} {'avg ms':>8} {'sites':>6}  command @ caller")
+    for total in aggregate_traces(trace_dir)[:limit]:
+        avg_ms = 1000 * total['total_seconds'] / total['count'] if total['count'] else 0
+        print(f"{total['total_seconds']:>10.2f} {total['count']:>8} {avg_ms:>8.1f} {total['sites']:>6}  "
+              f"{total['command']} @ {total['caller']}")
+    consent = summarize_consent(trace_dir)
+    if consent['sites']:
+        print(f"\nConsent overlay cleared on {consent['cleared']}/{consent['sites']} sites, "
+              f"avg {consent['total_seconds'] / consent['sites']:.2f}s per site")
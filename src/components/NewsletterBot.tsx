@@ -24,29 +24,36 @@ export default function NewsletterBot() {
     }
 
     setIsRunning(true)
-    const formData = new FormData()
-    formData.append('csv_file', csvFile)
 
     try {
-      const response = await fetch('/api/start-bot', {
+      // Sent as the raw body so the server can start processing rows while uploading
+      const response = await fetch(`/api/ingest?filename=${encodeURIComponent(csvFile.name)}`, {
         method: 'POST',
-        body: formData,
+        headers: { 'Content-Type': 'text/csv' },
+        body: csvFile,
       })
 
       if (!response.ok) {
         throw new Error('Failed to start bot')
       }
 
+      const { validation } = await response.json()
+      toast(`${validation.valid} valid, ${validation.invalid} invalid, ${validation.duplicate} duplicate URLs`)
+
       // Start progress polling
       const pollInterval = setInterval(async () => {
         const progressResponse = await fetch('/api/progress')
         const data = await progressResponse.json()
         setProgress(data.progress)
 
-        if (data.progress === 100 || data.status === 'completed') {
+        if (data.status === 'completed') {
           clearInterval(pollInterval)
           setIsRunning(false)
           toast.success('Newsletter registration completed!')
+        } else if (data.status === 'failed') {
+          clearInterval(pollInterval)
+          setIsRunning(false)
+          toast.error(`Bot stopped early at ${data.progress}%; the upload was kept for a re-run`)
         }
       }, 2000)
 
@@ -0,0 +1,116 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / 'api'))
+import bulk_newsletter
+import bot_server
+
+CSV_BODY = b'url\nhttps://a.com\nnot a url\nhttps://b.com\nhttps://www.a.com/x\n'
+
+class BrokenStream(io.BytesIO):
+    """Request body that fails after its first chunk, like a dropped connection."""
+    def __init__(self, first_chunk, declared_length=1024):
+        super().__init__(first_chunk.ljust(declared_length))
+        self.first_chunk = first_chunk
+
+    def readinto(self, buffer):
+        if not self.first_chunk:
+            raise OSError('connection reset')
+        size = min(len(buffer), len(self.first_chunk))
+        buffer[:size], self.first_chunk = self.first_chunk[:size], self.first_chunk[size:]
+        return size
+
+class TestBotServer(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.TemporaryDirectory()
+        self.processed = []
+        self.release = threading.Event()
+        self.release.set()
+        patches = [
+            mock.patch.object(bot_server, 'UPLOAD_DIR', self.upload_dir.name),
+            # Patched in the module dict: looking the name up would import the Selenium stack
+            mock.patch.dict(bulk_newsletter.__dict__, {'process_website': self.fake_process_website}),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        bot_server.is_running = False
+        bot_server.job_status = 'idle'
+        bot_server.current_progress = 0
+        bot_server.ingest_stats = {}
+        self.client = bot_server.app.test_client()
+
+    def tearDown(self):
+        self.release.set()
+        self.wait_for_job()
+        self.upload_dir.cleanup()
+
+    def fake_process_website(self, email, website, index, metrics=None):
+        self.release.wait(5)
+        self.processed.append(website)
+        return "Success"
+
+    def wait_for_job(self):
+        deadline = time.monotonic() + 5
+        while bot_server.is_running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(bot_server.is_running)
+
+    def test_ingest_rejects_second_job(self):
+        """Test a second upload is refused while a job is running"""
+        bot_server.is_running = True
+        response = self.client.post('/api/ingest?filename=sites.csv', data=CSV_BODY)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(os.listdir(self.upload_dir.name), [])
+        bot_server.is_running = False
+
+    def test_ingest_success_removes_spool(self):
+        """Test validation stats are returned and the spooled files are removed after a full run"""
+        response = self.client.post('/api/ingest?filename=sites.csv', data=CSV_BODY,
+                                    content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['validation'], {'valid': 2, 'invalid': 1, 'duplicate': 1})
+        self.wait_for_job()
+        self.assertEqual(sorted(self.processed), ['https://a.com', 'https://b.com'])
+        self.assertEqual(os.listdir(self.upload_dir.name), [])
+        progress = self.client.get('/api/progress').get_json()
+        self.assertEqual((progress['progress'], progress['status']), (100, 'completed'))
+
+    def test_ingest_failure_keeps_spool(self):
+        """Test a broken upload is reported as failed and its spooled files are kept for a re-run"""
+        response = self.client.post('/api/ingest?filename=sites.csv', content_type='text/csv',
+                                    input_stream=BrokenStream(b'url\nhttps://a.com\n'))
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json()['validation']['valid'], 1)
+        self.wait_for_job()
+        self.assertEqual(len(os.listdir(self.upload_dir.name)), 2)
+        progress = self.client.get('/api/progress').get_json()
+        self.assertEqual(progress['status'], 'failed')
+        self.assertLess(progress['progress'], 100)
+
+    def test_start_bot_resets_previous_job(self):
+        """Test a new run does not report the previous job's progress or validation stats"""
+        bot_server.current_progress = 100
+        bot_server.job_status = 'completed'
+        bot_server.ingest_stats = {'valid': 7, 'invalid': 3, 'duplicate': 1}
+        self.release.clear()
+        response = self.client.post('/api/start-bot', data={
+            'csv_file': (io.BytesIO(CSV_BODY), 'sites.csv')
+        })
+        self.assertEqual(response.status_code, 200)
+        progress = self.client.get('/api/progress').get_json()
+        self.assertEqual(progress, {
+            'progress': 0,
+            'status': 'running',
+            'validation': {'valid': 0, 'invalid': 0, 'duplicate': 0}
+        })
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
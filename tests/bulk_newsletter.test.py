@@ -1,8 +1,14 @@
 import unittest
 import sys
+import io
+import os
+import csv
+import logging
+import tempfile
+import threading
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
-from bulk_newsletter import extract_main_domain, check_for_captcha
+from bulk_newsletter import extract_main_domain, check_for_captcha, find_email_inputs_in_html, parse_company_info, iter_text_lines, iter_websites, tail_lines
 
 class TestBulkNewsletter(unittest.TestCase):
     def test_extract_main_domain(self):
@@ -37,5 +43,68 @@ class TestBulkNewsletter(unittest.TestCase):
                 result = check_for_captcha(html_content)
                 self.assertEqual(result, expected)
 
+    def test_import_is_side_effect_free(self):
+        """Test importing the package neither loads Selenium nor configures logging"""
+        self.assertNotIn('selenium', sys.modules)
+        self.assertNotIn('bulk_newsletter.browser', sys.modules)
+        self.assertFalse(any(isinstance(h, logging.FileHandler) for h in logging.getLogger().handlers))
+
+    def test_find_email_inputs_in_html(self):
+        """Test email input detection on raw HTML"""
+        html = (
+            '<form><input type="text" name="q">'
+            '<input type="email" name="EMAIL">'
+            '<input type="text" name="email_confirm">'
+            '<input placeholder="Ihre E-Mail-Adresse"></form>'
+        )
+        inputs = find_email_inputs_in_html(html)
+        self.assertEqual([attrs.get('name') for attrs in inputs], ['EMAIL', None])
+
+    def test_parse_company_info(self):
+        """Test company info extraction from imprint text"""
+        text = "Firma: Beispiel GmbH\nGeschäftsführer: Erika Muster\nE-Mail: info@beispiel.de"
+        info = parse_company_info(text, 'https://beispiel.de')
+        self.assertEqual(info['Website'], 'https://beispiel.de')
+        self.assertEqual(info['Company Name'], 'Beispiel GmbH')
+        self.assertEqual(info['CEO/Managing Director'], 'Erika Muster')
+        self.assertEqual(info['Email'], 'info@beispiel.de')
+
+    def test_iter_text_lines(self):
+        """Test lines are reassembled across chunk boundaries and spooled unchanged"""
+        raw = 'website\nhttps://müller.de/\n"https://a.com/x,y"\nhttps://b.com'.encode('utf-8')
+        spool = io.BytesIO()
+        lines = list(iter_text_lines(io.BytesIO(raw), spool, chunk_size=3))
+        self.assertEqual(''.join(lines).encode('utf-8'), raw)
+        self.assertEqual(lines[1], 'https://müller.de/\n')
+        self.assertEqual(spool.getvalue(), raw)
+
+    def test_iter_websites_stats(self):
+        """Test row validation counts valid, invalid and duplicate websites"""
+        rows = csv.reader(['https://www.a.com/x\n', 'not a url\n', 'https://a.com\n', '\n', 'http://b.com\n'])
+        stats = {}
+        websites = list(iter_websites(rows, stats, deduplicate=True))
+        self.assertEqual(websites, ['https://a.com', 'http://b.com'])
+        self.assertEqual(stats, {'valid': 2, 'invalid': 1, 'duplicate': 1})
+
+    def test_tail_lines_follows_writer(self):
+        """Test the spool reader waits for partial lines and stops once the writer is done"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'sites')
+            done = threading.Event()
+            with open(path, 'w', encoding='utf-8') as sites_file:
+                sites_file.write('https://a.com\nhttps://b')
+                sites_file.flush()
+
+                def finish_writing():
+                    sites_file.write('.com\nhttps://c.com\n')
+                    sites_file.flush()
+                    done.set()
+
+                writer = threading.Timer(0.05, finish_writing)
+                writer.start()
+                lines = list(tail_lines(path, done.is_set, poll_interval=0.01))
+                writer.join()
+        self.assertEqual(lines, ['https://a.com', 'https://b.com', 'https://c.com'])
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
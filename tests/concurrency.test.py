@@ -0,0 +1,195 @@
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from bulk_newsletter import concurrency
+from bulk_newsletter.concurrency import AdaptiveConcurrency, run_adaptive, is_transient_result, load_page_timed
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_controller(clock, load=0.1, memory=8000, **kwargs):
+    return AdaptiveConcurrency(sample_cpu=lambda: load, sample_memory=lambda: memory, clock=clock, **kwargs)
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def feed(self, controller, clock, results, seconds=10.0):
+        for result in results:
+            controller.record(result, seconds)
+        clock.now += concurrency.DECISION_INTERVAL_SECONDS
+        return controller.maybe_adjust()
+
+    def test_transient_results(self):
+        """Test which results count as host-overload errors"""
+        self.assertTrue(is_transient_result("Timeout"))
+        self.assertTrue(is_transient_result("WebDriver Error"))
+        self.assertTrue(is_transient_result("Error: Message: session not created: DevToolsActivePort file doesn't exist"))
+        self.assertTrue(is_transient_result("Error: Message: timeout: Timed out receiving message from renderer: 30.000"))
+        self.assertFalse(is_transient_result("Error: Message: unknown error: net::ERR_NAME_NOT_RESOLVED"))
+        self.assertFalse(is_transient_result("Error: Message: unknown error: net::ERR_CONNECTION_REFUSED"))
+        self.assertFalse(is_transient_result("No Form"))
+        self.assertFalse(is_transient_result("CAPTCHA"))
+
+    def test_additive_increase_up_to_max(self):
+        """Test the target grows by one per healthy interval and stops at the upper bound"""
+        clock = FakeClock()
+        controller = make_controller(clock, min_workers=1, max_workers=3, start_workers=1)
+        targets = [self.feed(controller, clock, ["Success"] * 3) for _ in range(4)]
+        self.assertEqual(targets, [2, 3, 3, 3])
+
+    def test_no_decision_before_interval(self):
+        """Test the target is unchanged until the decision interval has passed"""
+        clock = FakeClock()
+        controller = make_controller(clock, min_workers=1, max_workers=4, start_workers=2)
+        for _ in range(5):
+            controller.record("Success", 5.0)
+        self.assertEqual(controller.maybe_adjust(), 2)
+
+    def test_error_rate_needs_enough_samples(self):
+        """Test a dead domain in a small window does not back off, but a real error rate does"""
+        clock = FakeClock()
+        controller = make_controller(clock, min_workers=1, max_workers=16, start_workers=8)
+        self.assertEqual(self.feed(controller, clock, ["Timeout", "Success", "Success"]), 9)
+        dead_sites = ["Error: Message: unknown error: net::ERR_NAME_NOT_RESOLVED"] * 5
+        self.assertEqual(self.feed(controller, clock, dead_sites + ["Success"] * 5), 10)
+        self.assertEqual(self.feed(controller, clock, ["Timeout", "WebDriver Error", "Timeout"] + ["Success"] * 7), 5)
+
+    def test_multiplicative_decrease(self):
+        """Test memory pressure, CPU load and page-load latency each halve the target"""
+        clock = FakeClock()
+        controller = make_controller(clock, memory=200, min_workers=1, max_workers=16, start_workers=8)
+        self.assertEqual(self.feed(controller, clock, ["Success"] * 3), 4)
+
+        controller = make_controller(clock, load=3.0, min_workers=1, max_workers=16, start_workers=8)
+        self.assertEqual(self.feed(controller, clock, ["Success"] * 3), 4)
+
+        controller = make_controller(clock, min_workers=2, max_workers=16, start_workers=8)
+        self.feed(controller, clock, ["Success"] * 3, seconds=2.0)
+        self.assertEqual(self.feed(controller, clock, ["Success"] * 3, seconds=6.0), 4)
+        self.assertEqual(self.feed(controller, clock, ["Success"] * 3, seconds=12.0), 2)
+        self.assertEqual(self.feed(controller, clock, ["Success"] * 3, seconds=18.0), 2)
+
+    def test_sites_without_page_load_skip_latency(self):
+        """Test sites that never loaded count for errors but not for latency"""
+        clock = FakeClock()
+        controller = make_controller(clock, min_workers=1, max_workers=16, start_workers=4)
+        self.feed(controller, clock, ["Success"] * 3, seconds=2.0)
+        for _ in range(3):
+            controller.record("Error: Message: session not created", None)
+        clock.now += concurrency.DECISION_INTERVAL_SECONDS
+        self.assertEqual(controller.maybe_adjust(), 6)
+
+    def test_fast_window_does_not_collapse_baseline(self):
+        """Test one unusually fast window only lowers the best latency part of the way"""
+        clock = FakeClock()
+        controller = make_controller(clock, min_workers=1, max_workers=16, start_workers=4)
+        self.assertEqual(self.feed(controller, clock, ["Success"] * 3, seconds=10.0), 5)
+        self.assertEqual(self.feed(controller, clock, ["Success"] * 3, seconds=1.0), 6)
+        self.assertGreater(controller.best_latency, 5.0)
+        self.assertEqual(self.feed(controller, clock, ["Success"] * 3, seconds=10.0), 7)
+
+    def test_failed_page_load_reports_no_latency(self):
+        """Test a homepage that fails to load feeds no page-load time to the controller"""
+        class RecordingController(AdaptiveConcurrency):
+            def record(self, result, page_load_seconds=None):
+                latencies.append(page_load_seconds)
+                super().record(result, page_load_seconds)
+
+        class FakeDriver:
+            def get(self, url):
+                if 'dead' in url:
+                    raise Exception("Message: unknown error: net::ERR_NAME_NOT_RESOLVED")
+
+        latencies = []
+        controller = RecordingController(min_workers=1, max_workers=1, sample_cpu=None, sample_memory=None)
+        run_adaptive(['https://dead.example', 'https://live.example'],
+                     lambda website, i, metrics: load_page_timed(FakeDriver(), website, metrics) or "Success",
+                     controller=controller)
+        self.assertIsNone(latencies[0])
+        self.assertIsInstance(latencies[1], float)
+
+    def test_run_adaptive_fills_target(self):
+        """Test workers really overlap up to the target and never beyond it"""
+        target = 3
+        controller = make_controller(FakeClock(), min_workers=target, max_workers=target, start_workers=target)
+        barrier = threading.Barrier(target, timeout=5)
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+
+        def process(website, index, metrics):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            try:
+                # Only returns once `target` sites are in flight together
+                barrier.wait()
+            finally:
+                with lock:
+                    active[0] -= 1
+            metrics['page_load_seconds'] = 1.0
+            return "Success"
+
+        results = []
+        processed = run_adaptive((f"https://site{i}.com" for i in range(9)), process, controller,
+                                 on_result=lambda website, result: results.append(result))
+        self.assertEqual(processed, 9)
+        self.assertEqual(results, ["Success"] * 9)
+        self.assertEqual(active[1], target)
+
+    def test_run_adaptive_follows_target_changes(self):
+        """Test raising and lowering the target mid-run changes how many sites run at once"""
+        controller = make_controller(FakeClock(), min_workers=1, max_workers=4, start_workers=2)
+        gate = threading.Semaphore(0)
+        lock = threading.Lock()
+        active = [0]
+        started = []  # (index, sites active at start)
+
+        def process(website, index, metrics):
+            with lock:
+                active[0] += 1
+                started.append((index, active[0]))
+            gate.acquire(timeout=5)
+            with lock:
+                active[0] -= 1
+            return "Success"
+
+        def wait_for_active(count):
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                with lock:
+                    if active[0] == count:
+                        return True
+                time.sleep(0.005)
+            return False
+
+        runner = threading.Thread(target=run_adaptive,
+                                  args=((f"https://site{i}.com" for i in range(12)), process, controller))
+        runner.start()
+        try:
+            self.assertTrue(wait_for_active(2))
+            time.sleep(0.05)
+            self.assertEqual(len(started), 2)
+
+            controller.target = 4
+            gate.release()
+            self.assertTrue(wait_for_active(4))
+            time.sleep(0.05)
+            self.assertEqual(len(started), 5)
+
+            controller.target = 1
+        finally:
+            for _ in range(20):
+                gate.release()
+            runner.join(timeout=5)
+        self.assertFalse(runner.is_alive())
+        self.assertEqual(len(started), 12)
+        self.assertEqual(max(count for _, count in started), 4)
+        self.assertTrue(all(count == 1 for index, count in started if index > 5))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
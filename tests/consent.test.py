@@ -0,0 +1,95 @@
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+sys.path.append(str(Path(__file__).parent.parent))
+from bulk_newsletter import consent
+from bulk_newsletter.consent import dismiss_consent_overlay, CONSENT_FALLBACK_KEYWORDS, CONSENT_CONTAINER_MARKERS
+
+class FakeFrame:
+    def __init__(self, frame_id, fail_switch=False):
+        self.frame_id = frame_id
+        self.fail_switch = fail_switch
+
+    def get_attribute(self, name):
+        return self.frame_id if name == 'id' else None
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def frame(self, frame):
+        if frame.fail_switch:
+            raise RuntimeError('no such frame')
+        self.driver.current_frame = frame.frame_id
+
+    def default_content(self):
+        self.driver.default_content_calls += 1
+        self.driver.current_frame = None
+
+class FakeDriver:
+    """Returns a scripted consent-script result per frame (None = top-level page)."""
+    def __init__(self, results, frames=()):
+        self.results = results
+        self.frames = list(frames)
+        self.current_frame = None
+        self.default_content_calls = 0
+        self.script_calls = []
+        self.frame_selectors = []
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_script(self, script, selectors, keywords, markers, anywhere):
+        self.script_calls.append((self.current_frame, anywhere))
+        return self.results.get(self.current_frame, {'clicked': False})
+
+    def find_elements(self, by, selector):
+        self.frame_selectors.append((by, selector))
+        return self.frames
+
+@mock.patch.object(consent.time, 'sleep', lambda seconds: None)
+class TestConsentDismissal(unittest.TestCase):
+    def test_cleared_in_page_skips_iframes(self):
+        """Test a banner cleared in the page reports success without looking at iframes"""
+        driver = FakeDriver({None: {'clicked': True, 'via': 'selector', 'label': 'alle akzeptieren'}},
+                            [FakeFrame('sp_message_iframe_1')])
+        report = dismiss_consent_overlay(driver)
+        self.assertTrue(report['cleared'])
+        self.assertEqual(report['via'], 'selector')
+        self.assertIsNone(report['frame'])
+        self.assertIsInstance(report['seconds'], float)
+        self.assertEqual(driver.frame_selectors, [])
+        self.assertEqual(driver.script_calls, [(None, False)])
+
+    def test_iframe_fallback(self):
+        """Test consent iframes are searched in order and default content is always restored"""
+        driver = FakeDriver(
+            {'cmp-frame': {'clicked': True, 'via': 'keyword', 'label': 'accept all'}},
+            [FakeFrame('broken', fail_switch=True), FakeFrame('empty'), FakeFrame('cmp-frame'), FakeFrame('unused')]
+        )
+        report = dismiss_consent_overlay(driver)
+        self.assertTrue(report['cleared'])
+        self.assertEqual(report['frame'], 'cmp-frame')
+        self.assertEqual(driver.script_calls, [(None, False), ('empty', True), ('cmp-frame', True)])
+        self.assertEqual(driver.default_content_calls, 3)
+        self.assertIsNone(driver.current_frame)
+
+    def test_nothing_found(self):
+        """Test the report when no overlay exists anywhere"""
+        driver = FakeDriver({}, [FakeFrame('sp_message_iframe_1')])
+        report = dismiss_consent_overlay(driver)
+        self.assertFalse(report['cleared'])
+        self.assertIsNone(report['frame'])
+        self.assertEqual(driver.default_content_calls, 1)
+        self.assertGreaterEqual(report['seconds'], 0)
+
+    def test_fallback_is_conservative(self):
+        """Test ambiguous labels and generic page wrappers are never treated as consent dialogs"""
+        for keyword in ('ok', 'confirm', 'bestätigen'):
+            self.assertNotIn(keyword, CONSENT_FALLBACK_KEYWORDS)
+        self.assertIn('alle akzeptieren', CONSENT_FALLBACK_KEYWORDS)
+        for attrs in ('cmp-container aem-grid', 'newsletter-privacy', 'footer-datenschutz'):
+            self.assertFalse(any(marker in attrs for marker in CONSENT_CONTAINER_MARKERS), attrs)
+        self.assertTrue(any(marker in 'onetrust-banner-sdk' for marker in CONSENT_CONTAINER_MARKERS))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,59 @@
+import os
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from bulk_newsletter.snapshots import SnapshotArchive, snapshot_domain, PAGE_HOMEPAGE, PAGE_IMPRINT
+
+class TestSnapshotArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.archive = SnapshotArchive(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_snapshot_domain(self):
+        """Test archive keys are bare lowercase hosts"""
+        self.assertEqual(snapshot_domain('https://www.Example.com/page'), 'example.com')
+        self.assertEqual(snapshot_domain('http://shop.example.de'), 'shop.example.de')
+
+    def test_round_trip(self):
+        """Test a saved page can be read back from the index"""
+        self.archive.save_page('https://example.com', PAGE_IMPRINT, 'https://example.com/impressum',
+                               '<html><body>Impressum</body></html>', 'Impressum')
+        entries = list(self.archive.iter_entries())
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['domain'], 'example.com')
+        html, text = self.archive.load_page(entries[0])
+        self.assertEqual(html, '<html><body>Impressum</body></html>')
+        self.assertEqual(text, 'Impressum')
+
+    def test_identical_content_is_stored_once(self):
+        """Test blobs are deduplicated by content hash"""
+        for _ in range(3):
+            self.archive.save_page('https://example.com', PAGE_HOMEPAGE, 'https://example.com', '<p>same</p>', 'same')
+        blob_files = [name for _, _, files in os.walk(self.archive.blob_dir) for name in files]
+        self.assertEqual(len(blob_files), 2)
+        self.assertEqual(len(list(self.archive.iter_entries())), 3)
+
+    def test_filters_and_latest(self):
+        """Test index filtering by domain/page and latest-per-site selection"""
+        self.archive.save_page('https://a.com', PAGE_HOMEPAGE, 'https://a.com', 'old', 'old')
+        self.archive.save_page('https://a.com', PAGE_HOMEPAGE, 'https://a.com', 'new', 'new')
+        self.archive.save_page('https://b.com', PAGE_IMPRINT, 'https://b.com/imprint', 'b', 'b')
+        self.assertEqual(len(list(self.archive.iter_entries(domain='a.com'))), 2)
+        self.assertEqual(len(list(self.archive.iter_entries(page_type=PAGE_IMPRINT))), 1)
+        latest = self.archive.latest_snapshots()
+        self.assertEqual(self.archive.get_blob(latest[('a.com', PAGE_HOMEPAGE)]['html']), 'new')
+
+    def test_corrupt_index_line_is_skipped(self):
+        """Test a truncated index line does not stop the reader"""
+        self.archive.save_page('https://a.com', PAGE_HOMEPAGE, 'https://a.com', 'x', 'x')
+        with open(self.archive.index_path, 'a', encoding='utf-8') as index_file:
+            index_file.write('{"domain": "b.c\n')
+        self.assertEqual(len(list(self.archive.iter_entries())), 1)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
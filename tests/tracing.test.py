@@ -0,0 +1,99 @@
+import os
+import json
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from bulk_newsletter import tracing
+from bulk_newsletter.tracing import SiteTrace, instrument_driver, aggregate_traces, annotate_site_trace, summarize_consent
+
+class FakeExecutor:
+    def execute(self, command, params):
+        if command == 'fail':
+            raise RuntimeError('boom')
+        return {'value': None}
+
+class FakeDriver:
+    def __init__(self):
+        self.command_executor = FakeExecutor()
+
+    def find_elements(self):
+        return self.command_executor.execute('findElements', {})
+
+def lookup_imprint(driver):
+    return driver.find_elements()
+
+class TestTracing(unittest.TestCase):
+    def test_commands_attributed_to_caller(self):
+        """Test commands are counted per calling function outside the driver"""
+        driver = FakeDriver()
+        trace = SiteTrace('https://example.com', 1)
+        original = instrument_driver(driver, trace)
+        for _ in range(3):
+            lookup_imprint(driver)
+        with self.assertRaises(RuntimeError):
+            driver.command_executor.execute('fail', {})
+        tracing.uninstrument_driver(driver, original)
+        driver.find_elements()
+
+        module = __name__.rsplit('.', 1)[-1]
+        self.assertEqual(trace.commands[('findElements', f'{module}.find_elements')][0], 3)
+        self.assertEqual(trace.commands[('fail', f'{module}.test_commands_attributed_to_caller')][3], 1)
+        self.assertEqual(trace.to_dict()['command_count'], 4)
+
+    def test_site_trace_written_and_aggregated(self):
+        """Test per-site trace files are written and summed across sites"""
+        with tempfile.TemporaryDirectory() as trace_dir:
+            old_dir, old_rate = tracing.TRACE_DIR, tracing.PROFILE_SAMPLE_RATE
+            tracing.TRACE_DIR, tracing.PROFILE_SAMPLE_RATE = trace_dir, 1.0
+            try:
+                for site in ('https://a.com', 'https://b.com'):
+                    driver = FakeDriver()
+                    handle = tracing.start_site_trace(driver, site, 7)
+                    lookup_imprint(driver)
+                    annotate_site_trace(handle, 'consent', {'cleared': site == 'https://a.com', 'seconds': 0.5})
+                    path = tracing.finish_site_trace(handle)
+                    self.assertTrue(os.path.exists(path))
+                    self.assertTrue(os.path.exists(path[:-len('.json')] + '.prof'))
+            finally:
+                tracing.TRACE_DIR, tracing.PROFILE_SAMPLE_RATE = old_dir, old_rate
+
+            with open(path, encoding='utf-8') as trace_file:
+                self.assertTrue(json.load(trace_file)['profiled'])
+            totals = aggregate_traces(trace_dir)
+            self.assertEqual(len(totals), 1)
+            self.assertEqual(totals[0]['count'], 2)
+            self.assertEqual(totals[0]['sites'], 2)
+            self.assertEqual(summarize_consent(trace_dir), {'sites': 2, 'cleared': 1, 'total_seconds': 1.0})
+
+    def test_one_profiled_site_at_a_time(self):
+        """Test overlapping sites share the profiler one at a time and are all traced"""
+        with tempfile.TemporaryDirectory() as trace_dir:
+            old_dir, old_rate = tracing.TRACE_DIR, tracing.PROFILE_SAMPLE_RATE
+            tracing.TRACE_DIR, tracing.PROFILE_SAMPLE_RATE = trace_dir, 1.0
+            try:
+                first = tracing.start_site_trace(FakeDriver(), 'https://a.com', 1)
+                second = tracing.start_site_trace(FakeDriver(), 'https://b.com', 2)
+                self.assertIsNotNone(first[0].profile)
+                self.assertIsNone(second[0].profile)
+                self.assertTrue(tracing.finish_site_trace(first))
+                self.assertTrue(tracing.finish_site_trace(second))
+
+                third = tracing.start_site_trace(FakeDriver(), 'https://c.com', 3)
+                self.assertIsNotNone(third[0].profile)
+                tracing.finish_site_trace(third)
+            finally:
+                tracing.TRACE_DIR, tracing.PROFILE_SAMPLE_RATE = old_dir, old_rate
+
+    def test_disabled_by_default(self):
+        """Test no handle is returned when no trace directory is configured"""
+        old_dir = tracing.TRACE_DIR
+        tracing.TRACE_DIR = None
+        try:
+            self.assertIsNone(tracing.start_site_trace(FakeDriver(), 'https://a.com'))
+        finally:
+            tracing.TRACE_DIR = old_dir
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)